@@ -1,9 +1,31 @@
 # api/health.py
 from quart import Blueprint, jsonify
 
+from backend.services.domain_extractors import extraction_stats
+from backend.services.page_fetch import tier_stats
+from backend.services.token_budget import usage
+
 bp = Blueprint("health", __name__)
 
 
 @bp.get("/health")
 async def health():
     return jsonify({"status": "ok"})
+
+
+@bp.get("/health/llm-usage")
+async def llm_usage():
+    # Per-stage LLM calls, cache hits, truncations and token counts since start
+    return jsonify(usage.snapshot())
+
+
+@bp.get("/health/extraction")
+async def extraction():
+    # Per-domain article extraction outcomes: site rules, generic, LLM fallback
+    return jsonify(extraction_stats.snapshot())
+
+
+@bp.get("/health/fetch")
+async def fetch_tiers():
+    # Per-domain page fetches by tier: http, http_not_modified, browser, failed
+    return jsonify(tier_stats.snapshot())
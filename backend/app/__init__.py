@@ -4,7 +4,10 @@ from quart import Quart, jsonify
 from quart_cors import cors
 from dotenv import load_dotenv
 from backend.db.session import engine
-from backend.db.models import Base
+from backend.db.schema import ensure_vector_index, init_schema
+from backend.repositories.articles import warm_recent_index
+from backend.services.browser_pool import get_browser_pool
+from backend.services.page_fetch import aclose_http_client
 from backend.app.register_blueprints import register_blueprints
 from werkzeug.exceptions import HTTPException
 
@@ -35,7 +38,16 @@ def create_app() -> Quart:
     @app.before_serving
     async def init_db():
         async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+            await init_schema(conn)
+        # Built concurrently in the background; startup doesn't wait for it
+        app.add_background_task(ensure_vector_index, engine)
+        n = await warm_recent_index()
+        app.logger.info("Recent-article vector index warmed with %d rows", n)
+
+    @app.after_serving
+    async def close_fetchers():
+        await get_browser_pool().close()
+        await aclose_http_client()
 
     register_blueprints(app)  # /api/* endpoints
     return app
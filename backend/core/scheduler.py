@@ -0,0 +1,144 @@
+# core/scheduler.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Dict, Optional
+
+from sqlalchemy import select, update
+
+from backend.core.source_timer import SourceTimer, initial_interval
+from backend.db.models import Source
+from backend.db.session import AsyncSessionLocal
+from backend.utils.helpers import utcnow
+
+logger = logging.getLogger(__name__)
+
+# How often the sources table is re-read (new, disabled, removed sources)
+SCHEDULER_REFRESH_S = float(os.getenv("SCHEDULER_REFRESH_S", "60"))
+# Sources whose graph runs at the same time
+SCHEDULER_MAX_CONCURRENT = int(os.getenv("SCHEDULER_MAX_CONCURRENT", "4"))
+# A hung run is cancelled and counted as a failure
+SCHEDULER_RUN_TIMEOUT_S = float(os.getenv("SCHEDULER_RUN_TIMEOUT_S", "1800"))
+
+
+class SourceScheduler:
+    """
+    Polls every enabled row of `sources` on its own adaptive interval. Each
+    source runs in its own task, so a slow or failing source never delays
+    the others and a source's next tick can't start before its previous one
+    finished; at most SCHEDULER_MAX_CONCURRENT graph runs happen at once.
+    """
+
+    def __init__(self, graph, session_factory=AsyncSessionLocal):
+        self.graph = graph
+        self._sessions = session_factory
+        self._timers: Dict[uuid.UUID, SourceTimer] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    async def _sync_sources(self) -> None:
+        async with self._sessions() as session:
+            rows = (
+                await session.execute(
+                    select(Source.id, Source.url, Source.articles_per_day, Source.last_update).where(
+                        Source.enabled.is_(True)
+                    )
+                )
+            ).all()
+
+        enabled = {r.id for r in rows}
+        for source_id in list(self._timers):
+            if source_id not in enabled:
+                timer = self._timers.pop(source_id)
+                if timer.task is not None:
+                    timer.task.cancel()
+
+        for r in rows:
+            if r.id in self._timers:
+                self._timers[r.id].url = r.url
+                continue
+            interval = initial_interval(r.articles_per_day)
+            # Resume the schedule across restarts instead of polling everything at once
+            delay = 0.0
+            if r.last_update is not None:
+                delay = max(0.0, interval - (utcnow() - r.last_update).total_seconds())
+            timer = SourceTimer(r.id, r.url, interval, delay)
+            timer.task = asyncio.create_task(self._source_loop(timer), name=f"source:{r.url}")
+            self._timers[r.id] = timer
+
+    async def _source_loop(self, timer: SourceTimer) -> None:
+        while not self._stopping.is_set():
+            wait = timer.next_run - time.monotonic()
+            if wait > 0:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=wait)
+                    return
+                except asyncio.TimeoutError:
+                    pass
+            async with self._slots:
+                await self._tick(timer)
+
+    async def _tick(self, timer: SourceTimer) -> None:
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(SCHEDULER_RUN_TIMEOUT_S):
+                result = await self.graph.ainvoke({"link": timer.url})
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            timer.after_failure()
+            logger.exception(
+                "Source %s failed (%d in a row), next try in %.0fs",
+                timer.url, timer.failures, timer.next_run - time.monotonic(),
+            )
+            await self._record(timer, status="error")
+            return
+
+        new_articles = len((result or {}).get("new_articles") or [])
+        timer.after_success(new_articles)
+        logger.info(
+            "Source %s: %d new in %.1fs, next in %.0fs",
+            timer.url, new_articles, time.monotonic() - started, timer.interval,
+        )
+        await self._record(timer, status="active", last_update=utcnow())
+
+    async def _record(self, timer: SourceTimer, status: str, last_update=None) -> None:
+        values = {"status": status}
+        if last_update is not None:
+            values["last_update"] = last_update
+        try:
+            async with self._sessions() as session:
+                await session.execute(
+                    update(Source).where(Source.id == timer.source_id).values(**values)
+                )
+                await session.commit()
+        except Exception:
+            logger.warning("Could not update source %s", timer.url, exc_info=True)
+
+    async def run(self) -> None:
+        self._stopping = asyncio.Event()
+        self._slots = asyncio.Semaphore(SCHEDULER_MAX_CONCURRENT)
+        try:
+            while not self._stopping.is_set():
+                try:
+                    await self._sync_sources()
+                except Exception:
+                    logger.exception("Reading sources failed")
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=SCHEDULER_REFRESH_S)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            tasks = [t.task for t in self._timers.values() if t.task is not None]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._timers.clear()
+
+    def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
@@ -0,0 +1,51 @@
+# core/source_timer.py
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+import uuid
+from typing import Optional
+
+SCHEDULER_MIN_INTERVAL_S = float(os.getenv("SCHEDULER_MIN_INTERVAL_S", "120"))
+SCHEDULER_MAX_INTERVAL_S = float(os.getenv("SCHEDULER_MAX_INTERVAL_S", "3600"))
+# Used when a source has no articles_per_day estimate
+SCHEDULER_DEFAULT_INTERVAL_S = float(os.getenv("SCHEDULER_DEFAULT_INTERVAL_S", "500"))
+
+# Speed-up when a tick found new articles / slow-down when it found none
+_FASTER = 0.5
+_SLOWER = 1.5
+
+
+def _clamp(seconds: float) -> float:
+    return min(SCHEDULER_MAX_INTERVAL_S, max(SCHEDULER_MIN_INTERVAL_S, seconds))
+
+
+def initial_interval(articles_per_day) -> float:
+    """About one expected new article per tick."""
+    if not articles_per_day or float(articles_per_day) <= 0:
+        return _clamp(SCHEDULER_DEFAULT_INTERVAL_S)
+    return _clamp(86400.0 / float(articles_per_day))
+
+
+class SourceTimer:
+    """Adaptive poll interval and failure backoff of one source."""
+
+    def __init__(self, source_id: uuid.UUID, url: str, interval: float, delay: float):
+        self.source_id = source_id
+        self.url = url
+        self.interval = interval
+        self.failures = 0
+        self.next_run = time.monotonic() + delay
+        self.task: Optional[asyncio.Task] = None
+
+    def after_success(self, new_articles: int) -> None:
+        self.failures = 0
+        self.interval = _clamp(self.interval * (_FASTER if new_articles else _SLOWER))
+        self.next_run = time.monotonic() + self.interval
+
+    def after_failure(self) -> None:
+        # Exponential backoff from the current interval; the adaptive interval
+        # itself is kept for when the source recovers
+        self.failures += 1
+        self.next_run = time.monotonic() + _clamp(self.interval * 2 ** self.failures)
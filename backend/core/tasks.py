@@ -1,21 +1,19 @@
 # core/tasks.py
 from __future__ import annotations
-from datetime import timedelta
-from quart_tasks import QuartTasks
+from backend.core.scheduler import SourceScheduler
 from backend.pipelines.graphs.graph import graph
 
 
 def register_tasks(app):
-    tasks = QuartTasks(app)
+    # One adaptive polling loop per enabled row of the sources table
+    scheduler = SourceScheduler(graph)
 
-    @tasks.periodic(timedelta(seconds=500))
-    async def schedule():
-        sources = [
-            # "https://www.cnbc.com/id/100003114/device/rss/rss.html",
-            # "https://www.reuters.com/world/",
-            "https://finance.yahoo.com/news/"
-        ]
-        for source in sources:
-            await graph.ainvoke({"link": source})
+    @app.before_serving
+    async def start_scheduler():
+        app.add_background_task(scheduler.run)
 
-    return tasks
+    @app.after_serving
+    async def stop_scheduler():
+        scheduler.stop()
+
+    return scheduler
@@ -39,6 +39,28 @@ class Article(Base):
     content_emb = Column(Vector1536)
     provider = Column(String, nullable=True)
     image_url = Column(String, nullable=True)
+    # SimHash bands of hash_64 (services.dedup.simhash_bands) for indexed near-dup lookup
+    simhash_band_0 = Column(Integer, nullable=True)
+    simhash_band_1 = Column(Integer, nullable=True)
+    simhash_band_2 = Column(Integer, nullable=True)
+    simhash_band_3 = Column(Integer, nullable=True)
+    # SimHash of title + raw text, known before normalization (pre-LLM dedup gate)
+    raw_hash_64 = Column(Numeric, nullable=True)
+    raw_simhash_band_0 = Column(Integer, nullable=True)
+    raw_simhash_band_1 = Column(Integer, nullable=True)
+    raw_simhash_band_2 = Column(Integer, nullable=True)
+    raw_simhash_band_3 = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_articles_simhash_band_0", "simhash_band_0", "fetched_at"),
+        Index("ix_articles_simhash_band_1", "simhash_band_1", "fetched_at"),
+        Index("ix_articles_simhash_band_2", "simhash_band_2", "fetched_at"),
+        Index("ix_articles_simhash_band_3", "simhash_band_3", "fetched_at"),
+        Index("ix_articles_raw_simhash_band_0", "raw_simhash_band_0", "fetched_at"),
+        Index("ix_articles_raw_simhash_band_1", "raw_simhash_band_1", "fetched_at"),
+        Index("ix_articles_raw_simhash_band_2", "raw_simhash_band_2", "fetched_at"),
+        Index("ix_articles_raw_simhash_band_3", "raw_simhash_band_3", "fetched_at"),
+    )
 
 
 class ArticleAnalysis(Base):
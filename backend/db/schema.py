@@ -0,0 +1,213 @@
+# db/schema.py
+from __future__ import annotations
+import logging
+import os
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import event, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from backend.db.models import Base, Source
+from backend.services.dedup import SIMHASH_BANDS, SIMHASH_BAND_BITS
+
+logger = logging.getLogger(__name__)
+
+# HNSW index on articles.content_emb (cosine distance, matching the `<=>` queries).
+# Changing m / ef_construction rebuilds the index at the next startup.
+ARTICLE_EMB_INDEX = "ix_articles_content_emb_hnsw"
+PGVECTOR_HNSW_M = int(os.getenv("PGVECTOR_HNSW_M", "16"))
+PGVECTOR_HNSW_EF_CONSTRUCTION = int(os.getenv("PGVECTOR_HNSW_EF_CONSTRUCTION", "64"))
+# Query-time candidate list size: higher = better recall, slower search
+PGVECTOR_HNSW_EF_SEARCH = int(os.getenv("PGVECTOR_HNSW_EF_SEARCH", "40"))
+# pgvector >= 0.8: keep scanning when a WHERE filter drops candidates
+# ("relaxed_order" / "strict_order"); empty leaves the server default
+PGVECTOR_HNSW_ITERATIVE_SCAN = os.getenv("PGVECTOR_HNSW_ITERATIVE_SCAN", "")
+
+
+# Seeded into `sources` by the seed_default_sources migration (the list
+# core/tasks.py used to poll). Runs once: emptying the table later is kept.
+DEFAULT_SOURCES = [
+    ("Yahoo Finance", "https://finance.yahoo.com/news/", True),
+    ("CNBC", "https://www.cnbc.com/id/100003114/device/rss/rss.html", False),
+    ("Reuters", "https://www.reuters.com/world/", False),
+]
+
+
+def _simhash_band_ddl(existing: Set[str]) -> List[str]:
+    """
+    create_all only creates missing tables, so columns and indexes added to an
+    existing `articles` table are applied here. `existing` are the columns the
+    table already has: a band column is added and backfilled only when it is
+    missing, so the full-table UPDATEs run once, not on every start.
+    """
+    mask = (1 << SIMHASH_BAND_BITS) - 1
+    stmts = []
+    if "raw_hash_64" not in existing:
+        stmts.append("ALTER TABLE articles ADD COLUMN IF NOT EXISTS raw_hash_64 NUMERIC")
+    for hash_col, prefix in (("hash_64", ""), ("raw_hash_64", "raw_")):
+        for i in range(SIMHASH_BANDS):
+            col = f"{prefix}simhash_band_{i}"
+            if col not in existing:
+                stmts += [
+                    f"ALTER TABLE articles ADD COLUMN IF NOT EXISTS {col} INTEGER",
+                    # Backfill rows written before the band columns existed
+                    f"UPDATE articles SET {col} = "
+                    f"(({hash_col}::bigint >> {i * SIMHASH_BAND_BITS}) & {mask})::int "
+                    f"WHERE {col} IS NULL AND {hash_col} IS NOT NULL",
+                ]
+            stmts.append(
+                f"CREATE INDEX IF NOT EXISTS ix_articles_{col} ON articles ({col}, fetched_at)"
+            )
+    return stmts
+
+
+def _hnsw_ddl(name: str) -> str:
+    return (
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON articles "
+        f"USING hnsw (content_emb vector_cosine_ops) "
+        f"WITH (m = {PGVECTOR_HNSW_M}, ef_construction = {PGVECTOR_HNSW_EF_CONSTRUCTION})"
+    )
+
+
+async def ensure_vector_index(engine: AsyncEngine, rebuild: bool = False) -> None:
+    """
+    Create the HNSW index if it is missing. Built CONCURRENTLY in autocommit,
+    so writes to `articles` continue meanwhile. When its build parameters
+    differ from the settings, the index is only rebuilt with rebuild=True
+    (python -m backend.scripts.rebuild_vector_index): a new index is built
+    next to the old one and swapped in.
+    """
+    wanted = {f"m={PGVECTOR_HNSW_M}", f"ef_construction={PGVECTOR_HNSW_EF_CONSTRUCTION}"}
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        row = (
+            await conn.execute(
+                text(
+                    "SELECT c.reloptions, i.indisvalid FROM pg_class c "
+                    "JOIN pg_index i ON i.indexrelid = c.oid WHERE c.relname = :name"
+                ),
+                {"name": ARTICLE_EMB_INDEX},
+            )
+        ).first()
+        if row is not None and not row[1]:
+            # Left behind by an interrupted concurrent build
+            await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {ARTICLE_EMB_INDEX}"))
+            row = None
+        if row is None:
+            await conn.execute(text(_hnsw_ddl(ARTICLE_EMB_INDEX)))
+            return
+        if set(row[0] or []) == wanted:
+            return
+        if not rebuild:
+            logger.warning(
+                "%s was built with %s, settings ask for %s; run "
+                "python -m backend.scripts.rebuild_vector_index to rebuild",
+                ARTICLE_EMB_INDEX, sorted(row[0] or []), sorted(wanted),
+            )
+            return
+        tmp = f"{ARTICLE_EMB_INDEX}_new"
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {tmp}"))
+        await conn.execute(text(_hnsw_ddl(tmp)))
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY {ARTICLE_EMB_INDEX}"))
+        await conn.execute(text(f"ALTER INDEX {tmp} RENAME TO {ARTICLE_EMB_INDEX}"))
+
+
+async def init_schema(conn: AsyncConnection) -> None:
+    """
+    Tables, cheap DDL and one-off data migrations; the HNSW index is
+    ensure_vector_index()'s job.
+    """
+    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+    await conn.run_sync(Base.metadata.create_all)
+    existing = set(
+        (
+            await conn.execute(
+                text(
+                    "SELECT column_name FROM information_schema.columns "
+                    "WHERE table_name = 'articles'"
+                )
+            )
+        ).scalars()
+    )
+    for stmt in _simhash_band_ddl(existing):
+        await conn.execute(text(stmt))
+    await _apply_data_migrations(conn)
+
+
+async def _seed_default_sources(conn: AsyncConnection) -> None:
+    await conn.execute(
+        pg_insert(Source)
+        .values([{"name": n, "url": u, "enabled": e} for n, u, e in DEFAULT_SOURCES])
+        .on_conflict_do_nothing(index_elements=[Source.url])
+    )
+
+
+# One-off data changes, each applied once per database and recorded by name
+_DATA_MIGRATIONS = [
+    ("seed_default_sources", _seed_default_sources),
+]
+
+
+async def _apply_data_migrations(conn: AsyncConnection) -> None:
+    await conn.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "name TEXT PRIMARY KEY, applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+        )
+    )
+    applied = set((await conn.execute(text("SELECT name FROM schema_migrations"))).scalars())
+    for name, migrate in _DATA_MIGRATIONS:
+        if name in applied:
+            continue
+        await migrate(conn)
+        await conn.execute(
+            text("INSERT INTO schema_migrations (name) VALUES (:name) ON CONFLICT DO NOTHING"),
+            {"name": name},
+        )
+        logger.info("Applied data migration %s", name)
+
+
+def _vector_search_settings(scope: str) -> List[str]:
+    stmts = [f"SET {scope} hnsw.ef_search = {PGVECTOR_HNSW_EF_SEARCH}"]
+    if PGVECTOR_HNSW_ITERATIVE_SCAN:
+        stmts.append(f"SET {scope} hnsw.iterative_scan = {PGVECTOR_HNSW_ITERATIVE_SCAN}")
+    return stmts
+
+
+def register_vector_search_params(engine) -> None:
+    """
+    Apply the HNSW query settings once per pooled connection, so vector queries
+    (including the single-statement dedup insert) need no extra SET round trip.
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for stmt in _vector_search_settings("SESSION"):
+            cursor.execute(stmt)
+        cursor.close()
+        # Commit so the pool's reset-on-return rollback does not undo the SETs
+        dbapi_connection.commit()
+
+
+async def set_vector_search_params(session: AsyncSession) -> None:
+    """Apply HNSW query settings to the current transaction only (SET LOCAL)."""
+    for stmt in _vector_search_settings("LOCAL"):
+        await session.execute(text(stmt))
+
+
+async def explain_plan(
+    session: AsyncSession, stmt, params: Optional[Dict[str, Any]] = None
+) -> List[str]:
+    """EXPLAIN a SQLAlchemy statement with bound parameters; returns plan lines."""
+    compiled = stmt.compile(dialect=session.bind.dialect)
+    # Raw driver values: vectors may be passed as ndarray (binary codec) or list
+    bind_params = {**compiled.params, **(params or {})}
+    conn = await session.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN {compiled}", bind_params)
+    return [r[0] for r in result.fetchall()]
+
+
+def plan_uses_vector_index(plan: List[str]) -> bool:
+    return any(ARTICLE_EMB_INDEX in line for line in plan)
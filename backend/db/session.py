@@ -2,12 +2,16 @@ import os
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 from dotenv import load_dotenv
+from backend.db.types import register_vector_codec
+from backend.db.schema import register_vector_search_params
 
 load_dotenv()
 
 DATABASE_URL = os.environ["DATABASE_URL"]
 
 engine = create_async_engine(DATABASE_URL, pool_pre_ping=True)
+register_vector_codec(engine)
+register_vector_search_params(engine)
 SessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(
     engine, expire_on_commit=False
 )
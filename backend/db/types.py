@@ -1,26 +1,124 @@
+import struct
+
+import numpy as np
+from psycopg.adapt import Dumper, Loader
+from psycopg.pq import Format
+from psycopg.types import TypeInfo
+from sqlalchemy import event
 from sqlalchemy.types import UserDefinedType
-import json
+
+# pgvector binary send/recv format: uint16 dim, uint16 unused, dim big-endian float32
+_VECTOR_HEADER = struct.Struct(">HH")
+
+
+def encode_vector(value) -> bytes:
+    arr = np.asarray(value, dtype=">f4").ravel()
+    return _VECTOR_HEADER.pack(arr.shape[0], 0) + arr.tobytes()
+
+
+def decode_vector(buf) -> np.ndarray:
+    dim, _ = _VECTOR_HEADER.unpack_from(buf)
+    return np.frombuffer(buf, dtype=">f4", count=dim, offset=_VECTOR_HEADER.size).astype(
+        np.float32
+    )
+
+
+def parse_vector_text(value) -> np.ndarray:
+    # Text form is "[0.1,0.2,...]"; parsed in C rather than via json.loads
+    if isinstance(value, (bytes, memoryview)):
+        value = bytes(value).decode("ascii")
+    return np.fromstring(value.strip()[1:-1], dtype=np.float32, sep=",")
+
+
+class _VectorBinaryDumper(Dumper):
+    format = Format.BINARY
+
+    def dump(self, obj):
+        return encode_vector(obj)
+
+
+class _VectorTextDumper(Dumper):
+    # Used until the vector extension exists; the SQL casts the value
+    def dump(self, obj):
+        return ("[" + ",".join(map(str, np.asarray(obj).ravel().tolist())) + "]").encode()
+
+
+class _VectorBinaryLoader(Loader):
+    format = Format.BINARY
+
+    def load(self, data):
+        return decode_vector(data)
+
+
+class _VectorTextLoader(Loader):
+    def load(self, data):
+        return parse_vector_text(data)
+
+
+def register_vector_codec(engine) -> None:
+    """
+    Teach every new psycopg connection to send NumPy vectors in pgvector's
+    binary format and to load vector columns straight into float32 arrays.
+    Other drivers keep the list-of-floats path.
+    """
+    if engine.dialect.driver != "psycopg":
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        adapters = dbapi_connection.driver_connection.adapters
+        adapters.register_dumper(np.ndarray, _VectorTextDumper)
+        info = dbapi_connection.run_async(lambda conn: TypeInfo.fetch(conn, "vector"))
+        if info is None:
+            return
+        binary_dumper = type("VectorBinaryDumper", (_VectorBinaryDumper,), {"oid": info.oid})
+        adapters.register_dumper(np.ndarray, binary_dumper)
+        adapters.register_loader(info.oid, _VectorTextLoader)
+        adapters.register_loader(info.oid, _VectorBinaryLoader)
 
 
 class Vector1536(UserDefinedType):
+    """
+    pgvector column. Values come back as float32 NumPy arrays and may be bound
+    as arrays, sequences or pgvector binary buffers. as_list=True keeps the
+    older list-of-floats interface.
+    """
+
     cache_ok = True
 
+    def __init__(self, as_list: bool = False):
+        self.as_list = as_list
+
     def get_col_spec(self, **kw):
         return "vector(1536)"
 
     def bind_processor(self, dialect):
+        as_list = self.as_list or dialect.driver != "psycopg"
+
         def process(value):
-            # pgvector expects a Python list/tuple of floats
-            return None if value is None else list(value)
+            if value is None:
+                return None
+            if isinstance(value, (bytes, bytearray, memoryview)):
+                value = decode_vector(value)
+            # pgvector casts a float array to vector; numpy goes through the binary dumper
+            if as_list:
+                return np.asarray(value, dtype=np.float64).tolist()
+            return np.asarray(value, dtype=np.float32)
 
         return process
 
     def result_processor(self, dialect, coltype):
+        as_list = self.as_list
+
         def process(value):
-            # The value from the DB is a string like "[0.1, 0.2, ...]"
-            # We need to parse it into a list of floats.
             if value is None:
                 return None
-            return json.loads(value)
+            if isinstance(value, np.ndarray):
+                arr = value
+            elif isinstance(value, (bytes, bytearray, memoryview)) and bytes(value[:1]) != b"[":
+                arr = decode_vector(value)
+            else:
+                arr = parse_vector_text(value)
+            return arr.tolist() if as_list else arr
 
         return process
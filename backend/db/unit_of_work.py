@@ -0,0 +1,75 @@
+# db/unit_of_work.py
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.session import AsyncSessionLocal
+
+
+def on_commit(session: AsyncSession, fn: Callable[[], None]) -> None:
+    """Run `fn` once the session's current transaction commits (never on rollback)."""
+    event.listen(session.sync_session, "after_commit", lambda _s: fn(), once=True)
+
+
+class UnitOfWork:
+    """
+    Database side of one ingest run. Nodes never hold a transaction across
+    LLM calls: each database stage runs in its own short transaction through
+    session_scope(uow), which commits (or rolls back) and releases the
+    connection when the stage ends. The article row is therefore durable as
+    soon as it is inserted, whatever happens later in the run.
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self._factory = session_factory
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def session(self) -> AsyncSession:
+        # Opened lazily: runs that stop at the dedup gate may never need it
+        if self._session is None:
+            self._session = self._factory()
+        return self._session
+
+    async def end(self, commit: bool = True) -> None:
+        """Commit (or roll back) the current stage and release its connection."""
+        if self._session is None:
+            return
+        session, self._session = self._session, None
+        try:
+            if commit:
+                await session.commit()
+            else:
+                await session.rollback()
+        finally:
+            await session.close()
+
+    async def __aenter__(self) -> "UnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.end(commit=exc_type is None)
+
+
+@asynccontextmanager
+async def session_scope(uow: Optional[UnitOfWork] = None) -> AsyncIterator[AsyncSession]:
+    """
+    One short transaction: commits on success, rolls back on error. Inside an
+    ingest run it uses the run's unit of work and releases the connection
+    afterwards, so nothing stays idle in a transaction between stages.
+    """
+    if uow is not None:
+        try:
+            yield uow.session
+        except BaseException:
+            await uow.end(commit=False)
+            raise
+        await uow.end()
+        return
+    async with AsyncSessionLocal() as session:
+        yield session
+        await session.commit()
@@ -2,43 +2,55 @@ from langgraph.checkpoint.memory import MemorySaver
 from langgraph.constants import START, END
 from langgraph.graph import StateGraph
 from backend.pipelines.graphs.company_sentiment_analysis_graph.state import InputState, OverallState
-from backend.db.session import AsyncSessionLocal
+from sqlalchemy import select
+
+from backend.db.unit_of_work import session_scope
 from backend.db.models import EntitySentiment, Assets
+from backend.utils.loop_watchdog import watch_node
 import asyncio
+import logging
 
 
 from backend.pipelines.graphs.company_sentiment_analysis_graph.nodes.entity_extraction import entity_extraction
 from backend.pipelines.graphs.company_sentiment_analysis_graph.nodes.send_entity import send_entity
 from backend.pipelines.graphs.company_sentiment_analysis_graph.nodes.entity_sentiment_analysis import entity_sentiment_analysis
 
+logger = logging.getLogger(__name__)
 
-async def get_asset_id_by_name(asset_name: str):
-    async with AsyncSessionLocal() as session:
-        result = await session.execute(
-            Assets.__table__.select().where(Assets.label == asset_name)
-        )
-        asset = result.fetchone()
-        if not asset:
-            raise ValueError(f"Asset '{asset_name}' not found in DB")
-        return asset.id
-
-
-async def save_entity_sentiment(article_id: int, asset_name: str, label: str, score: float):
-    async with AsyncSessionLocal() as session:
-        asset_id = await get_asset_id_by_name(asset_name)
-        sentiment = EntitySentiment(
-            article_id=article_id,
-            asset_id=asset_id,
-            label=label,
-            score=score
-        )
-        session.add(sentiment)
-        await session.commit()
+
+async def get_asset_ids_by_name(session, asset_names) -> dict:
+    """Asset ids by label for the names that exist; missing names are logged and skipped."""
+    names = sorted(set(asset_names))
+    if not names:
+        return {}
+    result = await session.execute(
+        select(Assets.label, Assets.id).where(Assets.label.in_(names))
+    )
+    ids = {label: asset_id for label, asset_id in result.all()}
+    missing = [n for n in names if n not in ids]
+    if missing:
+        logger.warning("Assets not found in DB, skipping: %s", ", ".join(missing))
+    return ids
 
 
 async def save_all_entity(state: OverallState):
-    for a in state["entities_sentiment"]:
-        await save_entity_sentiment(state["insert_article_id"], a["entity"], a["label"], a["score"])
+    article_id = state.get("insert_article_id")
+    entities = state.get("entities_sentiment") or []
+    if article_id is None or not entities:
+        return {}
+    # One asset lookup for all entities; an unknown entity only drops its own row
+    async with session_scope(state.get("uow")) as session:
+        asset_ids = await get_asset_ids_by_name(session, [a["entity"] for a in entities])
+        session.add_all(
+            EntitySentiment(
+                article_id=article_id,
+                asset_id=asset_ids[a["entity"]],
+                label=a["label"],
+                score=a["score"],
+            )
+            for a in entities
+            if a["entity"] in asset_ids
+        )
     return {}
 
 
@@ -50,7 +62,7 @@ builder = StateGraph(OverallState,
 
 builder.add_node("Entity Extraction", entity_extraction)
 builder.add_node("Entity Sentiment Analysis", entity_sentiment_analysis)
-builder.add_node("Save Sentiment Analysis Results", save_all_entity)
+builder.add_node("Save Sentiment Analysis Results", watch_node(save_all_entity))
 
 
 builder.add_edge(START, "Entity Extraction")
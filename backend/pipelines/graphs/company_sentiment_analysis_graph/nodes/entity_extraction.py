@@ -12,6 +12,8 @@ from langchain_core.prompts import ChatPromptTemplate
 from dotenv import load_dotenv
 
 from backend.utils.helpers import extract_text_inside_tags
+from backend.services.llm_cache import invoke_cached
+from backend.services.token_budget import fit_to_budget
 
 import asyncio
 import base64
@@ -81,6 +83,7 @@ def entity_extraction(state: InputState) -> OverallState:
                 if isinstance(state["unstructured_article"], str)
                 else json.dumps(state["unstructured_article"], ensure_ascii=False)
             )
+            article_text = fit_to_budget("entity_extraction", article_text)
             message = HumanMessage(content=article_text)
 
             # Create message and prompt chain
@@ -89,9 +92,15 @@ def entity_extraction(state: InputState) -> OverallState:
                 message
             ])
 
-            # Invoke the model
-            assistant_chain = assistant_prompt | model
-            raw_response = assistant_chain.invoke({})
+            # Invoke the model; retries bypass the cached (unusable) answer
+            raw_response = invoke_cached(
+                assistant_prompt,
+                model,
+                {},
+                template_id="entity_extraction",
+                llm=model,
+                refresh=attempt > 1,
+            )
 
             # Extract hypothesis and validate
             answer = extract_text_inside_tags(raw_response.content, "answer")
@@ -9,11 +9,13 @@ from langgraph.graph import add_messages
 class InputState(TypedDict):
     unstructured_article: str
     insert_article_id: int
+    uow: object
 
 
 class OverallState(TypedDict):
     unstructured_article: str
     insert_article_id: int
+    uow: object
     entities_news: list
     entities_sentiment: Annotated[list[dict], operator.add]
 
@@ -1,7 +1,7 @@
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.constants import START, END
 from langgraph.graph import StateGraph
-from backend.pipelines.graphs.ingest_graph.ingest_graph import graph as ingest_graph
+from backend.pipelines.graphs.ingest_graph.ingest_graph import run_ingest
 from backend.pipelines.graphs.web_scrapper_graph.graph import graph as scrapper_graph
 from backend.pipelines.graphs.web_scrapper_graph.state import InitState, OverallState, OutputState
 from backend.pipelines.graphs.ingest_graph.state import GraphState
@@ -23,7 +23,7 @@ def end_of_graph(state: OutputState):
     return state
 
 builder.add_node("Scrap Posts", scrapper_graph)
-builder.add_node("Analyse Posts", ingest_graph)
+builder.add_node("Analyse Posts", run_ingest)
 builder.add_node("End of graph", end_of_graph)
 
 
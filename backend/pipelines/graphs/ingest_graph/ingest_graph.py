@@ -9,26 +9,54 @@ from backend.pipelines.graphs.ingest_graph.state import GraphState
 from backend.pipelines.graphs.web_scrapper_graph import graph as initial_graph
 from backend.pipelines.graphs.web_scrapper_graph.state import InitState, OverallState
 from backend.pipelines.graphs.ingest_graph.nodes.normalize_article import normalize_article
-from backend.repositories.articles import insert_article
+from backend.repositories.articles import find_known_article, insert_article, recent_index
 from backend.repositories.analysis import insert_analysis_packet
-from backend.pipelines.graphs.ingest_graph.nodes.news_analysis import analyze_news
+from backend.pipelines.graphs.ingest_graph.nodes.news_analysis import analyze_and_verify
 from backend.services.rag import get_style_guide, get_brand_snippets
-from backend.services.verify_output import verify_packet
-from backend.services.embeddings import embed_text
+from backend.services.dates import as_utc_datetime
+from backend.services.dedup import simhash64, to_signed_64
+from backend.services.embeddings import aembed_text, embed_scope
 from backend.db.session import SessionLocal
-from backend.db.session import AsyncSessionLocal
+from backend.db.unit_of_work import UnitOfWork, session_scope
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.db.models import Article
 from backend.db.types import Vector1536
+from backend.utils.loop_watchdog import watch_node
 from backend.pipelines.graphs.company_sentiment_analysis_graph.graph import graph as company_sentiment_analysis_graph
 
 
 # --- Nodes ---
 
 
+async def node_precheck(state: GraphState) -> GraphState:
+    # Cheap dedup before any LLM/embedding work: exact URL or raw-text SimHash
+    state["raw_hash_64"] = to_signed_64(
+        simhash64(f"{state.get('title') or ''} || {state.get('raw') or ''}")
+    )
+    async with session_scope(state.get("uow")) as session:
+        known = await find_known_article(state["url"], state["raw_hash_64"], session=session)
+    if known:
+        status, ref_url, metric = known
+        state["insert_status"] = status
+        state["insert_ref_url"] = ref_url
+        if metric is not None:
+            state["insert_metric"] = metric
+    return state
+
+
+def route_after_precheck(state: GraphState) -> str:
+    if state.get("insert_status") in ("duplicate", "exists"):
+        return "skip"
+    return "normalize"
+
+
 async def node_insert(state: GraphState) -> GraphState:
-    status, ref_url, metric, article_id = await insert_article(state["article_row"])
+    # Committed here, before the LLM stages: a later failure keeps the article
+    async with session_scope(state.get("uow")) as session:
+        status, ref_url, metric, article_id = await insert_article(
+            state["article_row"], session=session
+        )
     state["insert_status"] = status
     if ref_url:
         state["insert_ref_url"] = ref_url
@@ -48,19 +76,34 @@ def route_after_insert(state: GraphState) -> str:
     return "analyze"
 
 
+RELATED_K = 5
+
+
 async def node_fetch_related(state: GraphState) -> GraphState:
-    async with AsyncSessionLocal() as session:
-        result = await session.execute(
-            select(Article).where(Article.url == state["article_row"]["url"])
-        )
-        primary = result.scalars().first()
-        if not primary:
-            state["related_articles"] = []
+    # Served from the in-process recent-article index when it has enough neighbours
+    emb = state["article_row"].get("content_emb")
+    if emb is not None and recent_index.ready:
+        hits = recent_index.search(emb, k=RELATED_K, exclude_url=state["article_row"]["url"])
+        if len(hits) >= RELATED_K:
+            state["related_articles"] = [
+                {k: meta[k] for k in ("url", "title", "summary", "published_at", "source_domain")}
+                for _, meta in hits
+            ]
             return state
 
-        emb = primary.content_emb or embed_text(
-            f"{primary.title or ''}\n\n{primary.summary or ''}"
+    # The primary row is the one this run inserted; it is already in state
+    primary = state["article_row"]
+    if state.get("insert_status") != "inserted":
+        state["related_articles"] = []
+        return state
+
+    # Reuse the vector computed in normalize_article; embed only as a last resort
+    if emb is None:
+        emb = await aembed_text(
+            f"{primary.get('title') or ''}\n\n{primary.get('summary') or ''}",
+            stage="node_fetch_related",
         )
+    async with session_scope(state.get("uow")) as session:
         # emb_str = "[" + ",".join(f"{x:.6f}" for x in emb) + "]"
         dist = Article.content_emb.op("<=>")(cast(bindparam("emb"), Vector1536()))
         result = await session.execute(
@@ -72,9 +115,9 @@ async def node_fetch_related(state: GraphState) -> GraphState:
                 Article.source_domain,
                 Article.content_emb,
             )
-            .where(Article.url != primary.url, Article.content_emb.isnot(None))
+            .where(Article.url != primary["url"], Article.content_emb.isnot(None))
             .order_by(dist)
-            .limit(5),
+            .limit(RELATED_K),
             {"emb": emb},
         )
         rows = result.fetchall()
@@ -95,32 +138,35 @@ async def node_fetch_related(state: GraphState) -> GraphState:
 
 
 async def node_analyze(state: GraphState) -> GraphState:
-    async with AsyncSessionLocal() as session:
+    row = state["article_row"]
+    async with session_scope(state.get("uow")) as session:
         # Style and brand snippets (RAG)
         style = get_style_guide()
-        qtext = f"{state['article_row'].get('title', '')} {state['article_row'].get('summary', '')}"
-        rag = await get_brand_snippets(session, qtext, k=3)
-
-        # Build primary dict from DB row for consistency
-        stmt = select(Article).where(Article.url == state["article_row"]["url"])
-        result = await session.execute(stmt)
-        pr = result.scalar_one_or_none()
-        primary = {
-            "url": pr.url,
-            "title": pr.title,
-            "summary": pr.summary,
-            "published_at": pr.published_at,
-            "source_domain": pr.source_domain,
-        }
-
-        analysis_obj = analyze_news(
-            primary, state.get("related_articles", []), style, rag
-        )
-        state["analysis"] = analysis_obj.model_dump()
-        return state
+        qtext = f"{row.get('title', '')} {row.get('summary', '')}"
+        rag = await get_brand_snippets(session, qtext, k=3, emb=row.get("content_emb"))
+
+    # Primary built from the row carried in state (same values as stored)
+    primary = {
+        "url": row["url"],
+        "title": row["title"],
+        "summary": row["summary"],
+        "published_at": as_utc_datetime(row.get("published_at")),
+        "source_domain": row["source_domain"],
+    }
+
+    # Verification runs inside the analysis DAG, overlapping scoring/writing
+    run = await analyze_and_verify(
+        primary, state.get("related_articles", []), style, rag,
+        sources_text=_sources_text(state),
+    )
+    state["analysis"] = run.analysis.model_dump()
+    state["verified"] = run.verification.ok
+    state["verification_issues"] = run.verification.issues
+    state["analysis_timings"] = run.timings
+    return state
 
 
-async def node_verify_and_persist(state: GraphState) -> GraphState:
+def _sources_text(state: GraphState) -> str:
     # Build sources text for verification
     parts = []
     parts.append(
@@ -128,19 +174,20 @@ async def node_verify_and_persist(state: GraphState) -> GraphState:
     )
     for r in state.get("related_articles", []):
         parts.append(f"{r.get('title', '')} :: {r.get('summary', '')}")
-    sources_text = "\n\n".join(parts)
+    return "\n\n".join(parts)
 
-    ver = verify_packet(sources_text, state["analysis"])
-    state["verified"] = ver.ok
-    state["verification_issues"] = ver.issues
 
-    # Persist packet
-    async with AsyncSessionLocal() as session:
+async def node_verify_and_persist(state: GraphState) -> GraphState:
+    # Verification already ran inside node_analyze.
+    # Persist packet (committed before the sentiment stage). Semantic
+    # duplicates have no row of their own for the packet to reference.
+    if state.get("insert_status") != "inserted":
+        return state
+    async with session_scope(state.get("uow")) as session:
         cluster_urls = [x["url"] for x in state.get("related_articles", [])]
         await insert_analysis_packet(
             session, state["article_row"]["url"], state["analysis"], cluster_urls
         )
-        await session.commit()
 
     return state
 
@@ -148,14 +195,18 @@ async def node_verify_and_persist(state: GraphState) -> GraphState:
 # --- Build graph ---
 graph_builder = StateGraph(GraphState)
 
-graph_builder.add_node("normalize_article", normalize_article)
-graph_builder.add_node("insert", node_insert)
-graph_builder.add_node("fetch_related", node_fetch_related)
-graph_builder.add_node("analyze", node_analyze)
-graph_builder.add_node("verify_and_persist", node_verify_and_persist)
+graph_builder.add_node("precheck", watch_node(node_precheck))
+graph_builder.add_node("normalize_article", watch_node(normalize_article))
+graph_builder.add_node("insert", watch_node(node_insert))
+graph_builder.add_node("fetch_related", watch_node(node_fetch_related))
+graph_builder.add_node("analyze", watch_node(node_analyze))
+graph_builder.add_node("verify_and_persist", watch_node(node_verify_and_persist))
 graph_builder.add_node("sentiment_analysis", company_sentiment_analysis_graph)
 
-graph_builder.add_edge(START, "normalize_article")
+graph_builder.add_edge(START, "precheck")
+graph_builder.add_conditional_edges(
+    "precheck", route_after_precheck, {"skip": END, "normalize": "normalize_article"}
+)
 graph_builder.add_edge("normalize_article", "insert")
 graph_builder.add_conditional_edges(
     "insert", route_after_insert, {"skip": END, "analyze": "fetch_related"}
@@ -167,3 +218,15 @@ graph_builder.add_edge("sentiment_analysis", END)
 
 graph = graph_builder.compile()
 
+
+async def run_ingest(state: GraphState) -> dict:
+    """
+    Runs the ingest graph for one article inside a unit of work: each database
+    stage commits on its own, and no connection is held during LLM calls.
+    """
+    # embed_scope: the re-embed guard tracks API embeddings per article run
+    with embed_scope():
+        async with UnitOfWork() as uow:
+            await graph.ainvoke({**state, "uow": uow})
+    return {}
+
@@ -1,12 +1,26 @@
 # services/news_analysis.py
 from __future__ import annotations
-from typing import List, Optional, Dict, Any
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
 from datetime import datetime, timezone
 from pydantic import BaseModel, Field
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 
 from backend.services.event_taxonomy import EVENT_TYPES
+from backend.services.llm_cache import ainvoke_cached
+from backend.services.token_budget import fit_items, fit_to_budget
+from backend.services.verify_output import (
+    VerificationResult,
+    check_brief_numbers,
+    merge_verifications,
+    verify_packet,
+)
+
+logger = logging.getLogger(__name__)
 
 PORTFOLIO_MARKETS = {
     "fx_usd": "FX USD",
@@ -172,44 +186,52 @@ Source Citations:
 
 
 # ---------- Chains ----------
-def _extract(articles_block: str) -> ExtractedFacts:
-    chain = extract_prompt | _extractor.with_structured_output(
-        ExtractedFacts, method="function_calling"
-    )
-    return chain.invoke(
+async def _extract(articles_block: str) -> ExtractedFacts:
+    return await ainvoke_cached(
+        extract_prompt,
+        _extractor.with_structured_output(ExtractedFacts, method="function_calling"),
         {
             "articles_block": articles_block,
             "event_types": ", ".join(EVENT_TYPES),
             "market_keys": ", ".join(MARKET_KEYS),
-        }
+        },
+        template_id="news_analysis.extract",
+        llm=_extractor,
+        schema=ExtractedFacts,
     )
 
 
-def _score(meta: Dict[str, Any], extracted: ExtractedFacts) -> ImpactSignals:
-    chain = score_prompt | _scorer.with_structured_output(
-        ImpactSignals, method="function_calling"
+async def _score(meta: Dict[str, Any], extracted: ExtractedFacts) -> ImpactSignals:
+    return await ainvoke_cached(
+        score_prompt,
+        _scorer.with_structured_output(ImpactSignals, method="function_calling"),
+        {"meta": meta, "extracted": extracted.model_dump()},
+        template_id="news_analysis.score",
+        llm=_scorer,
+        schema=ImpactSignals,
     )
-    return chain.invoke({"meta": meta, "extracted": extracted.model_dump()})
 
 
-def _write(
+async def _write(
     style_guide: str,
     rag_snippets: str,
     extracted: ExtractedFacts,
     impact: ImpactSignals,
     citations: List[Dict[str, Any]],
 ) -> AnalystPacket:
-    chain = write_prompt | _writer.with_structured_output(
-        AnalystPacket, method="function_calling"
-    )
-    return chain.invoke(
+    return await ainvoke_cached(
+        write_prompt,
+        _writer.with_structured_output(AnalystPacket, method="function_calling"),
         {
             "style_guide": style_guide,
-            "rag_snippets": rag_snippets,
+            "rag_snippets": fit_to_budget("news_analysis.write", rag_snippets),
             "extracted": extracted.model_dump(),
             "impact": impact.model_dump(),
             "citations": citations,
-        }
+        },
+        template_id="news_analysis.write",
+        llm=_writer,
+        schema=AnalystPacket,
     )
 
 
@@ -249,22 +271,74 @@ def blend_scores(llm_score: int, det_score: float) -> int:
 
 
 # ---------- Orchestrator ----------
-def analyze_news(
-    primary_article: Dict[str, Any],
-    related_articles: List[Dict[str, Any]],
-    style_guide: str,
-    rag_snippets: str,
-) -> NewsAnalysis:
-    def pack(a):
-        ts = a.get("published_at")
-        return f"- {a.get('title','').strip()} [{a.get('source_domain','')} ; {ts}]\n  {a.get('summary','').strip()}"
+class StageGraph:
+    """
+    Minimal async dependency DAG: each stage starts as soon as the stages it
+    depends on have finished, and receives their results as arguments.
+    Records per-stage start offset and duration (ms) from the graph start.
+    """
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._tasks: Dict[str, asyncio.Future] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    def add(self, name: str, fn: Callable[..., Any], *deps: str) -> None:
+        async def run():
+            args = [await self._tasks[d] for d in deps]
+            start = time.perf_counter()
+            result = fn(*args)
+            if inspect.isawaitable(result):
+                result = await result
+            self.timings[name] = {
+                "start_ms": round((start - self._t0) * 1000, 1),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            }
+            return result
+
+        self._tasks[name] = asyncio.ensure_future(run())
+
+    async def results(self) -> Dict[str, Any]:
+        try:
+            values = await asyncio.gather(*self._tasks.values())
+        except BaseException:
+            for task in self._tasks.values():
+                task.cancel()
+            raise
+        self.timings["total"] = {
+            "start_ms": 0.0,
+            "duration_ms": round((time.perf_counter() - self._t0) * 1000, 1),
+        }
+        return dict(zip(self._tasks.keys(), values))
 
-    articles_block = "\n".join(
-        [pack(primary_article)] + [pack(x) for x in related_articles]
-    )
 
-    extracted = _extract(articles_block)
+class AnalysisRun(BaseModel):
+    analysis: NewsAnalysis
+    verification: Optional[VerificationResult] = None
+    timings: Dict[str, Dict[str, float]] = {}
+
+
+def _pack(a: Dict[str, Any]) -> str:
+    ts = a.get("published_at")
+    return f"- {a.get('title','').strip()} [{a.get('source_domain','')} ; {ts}]\n  {a.get('summary','').strip()}"
+
+
+def _citations(
+    primary_article: Dict[str, Any], related_articles: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    return [
+        {
+            "url": x.get("url"),
+            "title": x.get("title"),
+            "published_at": str(x.get("published_at")),
+        }
+        for x in [primary_article] + related_articles
+    ]
+
 
+def _meta(
+    primary_article: Dict[str, Any], related_articles: List[Dict[str, Any]]
+) -> Dict[str, Any]:
     now = datetime.now(timezone.utc)
     recency_hours = None
     if primary_article.get("published_at"):
@@ -273,39 +347,101 @@ def analyze_news(
             dt = dt.replace(tzinfo=timezone.utc)
         if dt:
             recency_hours = max(0.0, (now - dt).total_seconds() / 3600.0)
-
-    meta = {
+    return {
         "recency_hours": recency_hours,
         "source_domain": primary_article.get("source_domain"),
         "n_related": len(related_articles),
     }
-    impact_llm = _score(meta, extracted)
-    det = deterministic_score(meta, extracted)
-    impact_blended = ImpactSignals(
+
+
+def _blend(impact_llm: ImpactSignals, det: float) -> ImpactSignals:
+    return ImpactSignals(
         impact_score=blend_scores(impact_llm.impact_score, det),
         confidence=impact_llm.confidence,
         novelty=impact_llm.novelty,
         rationale=impact_llm.rationale,
     )
 
-    importance = Importance(importance=impact_blended.impact_score >= 60)
 
-    cites = [
-        {
-            "url": primary_article.get("url"),
-            "title": primary_article.get("title"),
-            "published_at": str(primary_article.get("published_at")),
-        }
-    ] + [
-        {
-            "url": x.get("url"),
-            "title": x.get("title"),
-            "published_at": str(x.get("published_at")),
-        }
-        for x in related_articles
-    ]
+async def analyze_and_verify(
+    primary_article: Dict[str, Any],
+    related_articles: List[Dict[str, Any]],
+    style_guide: str,
+    rag_snippets: str,
+    sources_text: Optional[str] = None,
+) -> AnalysisRun:
+    """
+    Runs the analysis as a stage DAG:
+
+        extract ─┬─ score ─┐
+                 ├─ det ───┴─ impact ─ write ─ check_brief
+                 └─ verify_facts
+        meta, citations (no inputs)
+
+    With sources_text, the extracted facts get the one LLM verification
+    call, running while the brief is scored and written; the brief is then
+    checked deterministically for figures not found in sources or facts.
+    """
+    # Related articles are dropped (whole) once the extract budget is used up
+    articles_block = "\n".join(
+        fit_items(
+            "news_analysis.extract",
+            [_pack(primary_article)] + [_pack(x) for x in related_articles],
+        )
+    )
 
-    packet = _write(style_guide, rag_snippets, extracted, impact_blended, cites)
-    return NewsAnalysis(
-        extracted=extracted, impact=impact_blended, packet=packet, importance=importance
+    dag = StageGraph()
+    dag.add("meta", lambda: _meta(primary_article, related_articles))
+    dag.add("citations", lambda: _citations(primary_article, related_articles))
+    dag.add("extract", lambda: _extract(articles_block))
+    dag.add("score", _score, "meta", "extract")
+    dag.add("det", deterministic_score, "meta", "extract")
+    dag.add("impact", _blend, "score", "det")
+    dag.add(
+        "write",
+        lambda extracted, impact, cites: _write(
+            style_guide, rag_snippets, extracted, impact, cites
+        ),
+        "extract",
+        "impact",
+        "citations",
     )
+    if sources_text is not None:
+        dag.add(
+            "verify_facts",
+            lambda extracted: verify_packet(
+                sources_text, {"extracted": extracted.model_dump()}
+            ),
+            "extract",
+        )
+        dag.add(
+            "check_brief",
+            lambda extracted, packet: check_brief_numbers(
+                sources_text, extracted.model_dump(), packet.model_dump()
+            ),
+            "extract",
+            "write",
+        )
+    r = await dag.results()
+
+    impact = r["impact"]
+    analysis = NewsAnalysis(
+        extracted=r["extract"],
+        impact=impact,
+        packet=r["write"],
+        importance=Importance(importance=impact.impact_score >= 60),
+    )
+    verification = (
+        merge_verifications(r["verify_facts"], r["check_brief"])
+        if sources_text is not None
+        else None
+    )
+    logger.info(
+        "analysis stages: %s",
+        ", ".join(
+            f"{name}=+{t['start_ms']:.0f}/{t['duration_ms']:.0f}ms"
+            for name, t in dag.timings.items()
+        ),
+    )
+    return AnalysisRun(analysis=analysis, verification=verification, timings=dag.timings)
+
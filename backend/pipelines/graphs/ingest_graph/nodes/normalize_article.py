@@ -10,23 +10,31 @@ from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
 
+from backend.services.dates import as_utc_datetime, parse_published
 from backend.services.dedup import simhash64, to_signed_64
 from backend.pipelines.graphs.ingest_graph.state import GraphState
-from backend.services.embeddings import embed_text
+from backend.services.embeddings import aembed_text
+from backend.services.llm_cache import ainvoke_cached
+from backend.services.token_budget import fit_to_budget
 
 load_dotenv()
 
 
-# This model now ONLY defines what the LLM is expected to extract.
+# These models now ONLY define what the LLM is expected to extract.
 # Title is removed as it's passed in directly.
-class ArticleNormalizationEntry(BaseModel):
+class ArticleSummaryEntry(BaseModel):
+    # Used when the scraped date already resolved: no date asked of the LLM
     summary: str = Field(None, description="2-4 sentence neutral summary")
-    published_at: date = Field(None, description="YYYY-MM-DD, if there is no year, then the current year is 2025")
     lang: Optional[str] = Field(None, description="Two-letter uppercase ISO 639-1")
 
 
-class ArticleEntry(ArticleNormalizationEntry):
+class ArticleNormalizationEntry(ArticleSummaryEntry):
+    published_at: Optional[date] = Field(None, description="YYYY-MM-DD, or null if not stated")
+
+
+class ArticleEntry(ArticleSummaryEntry):
     # The final, complete entry still includes the title.
+    published_at: Optional[datetime] = None
     title: str
     url: str
     image_url: str
@@ -34,6 +42,7 @@ class ArticleEntry(ArticleNormalizationEntry):
     source_domain: str
     fetched_at: datetime
     hash_64: int
+    raw_hash_64: Optional[int] = None
     content_emb: Optional[List[float]] = None
     provider: str
 
@@ -43,11 +52,7 @@ _model = ChatOpenAI(model="gpt-4o", temperature=0.1, max_retries=2)
 
 # --- ENHANCED & FOCUSED PROMPT ---
 # The prompt is updated to demand a more comprehensive summary.
-_prompt = ChatPromptTemplate.from_messages(
-    [
-        (
-            "system",
-            """
+_PROMPT_HEAD = """
 You are a meticulous and highly efficient news pre-processing engine. Your sole purpose is to extract and summarize raw article text into a structured, consistent JSON format, ensuring no critical financial details are lost.
 
 Given the unstructured article text, return a SINGLE JSON object with EXACTLY these keys.
@@ -59,36 +64,66 @@ Given the unstructured article text, return a SINGLE JSON object with EXACTLY th
     - The primary event, its cause, and its stated outcomes or consequences.
     - Any forward-looking statements, guidance, or analyst expectations.
   The summary should be dense with facts, objective, and written in neutral language. Do not include opinions, quotes, or HTML tags.
-- **`published_at`**: Find the primary publication date and format it as `YYYY-MM-DD`. If no date is clearly stated, return `null`.
-- **`lang`**: Identify the language of the article and return its two-letter ISO 639-1 code in UPPERCASE (e.g., 'EN', 'DE', 'FR'). If the language is unclear, return `null`.
+"""
+_PROMPT_DATE_RULE = """- **`published_at`**: Find the primary publication date and format it as `YYYY-MM-DD`. If no date is clearly stated, return `null`.
+"""
+_PROMPT_TAIL = """- **`lang`**: Identify the language of the article and return its two-letter ISO 639-1 code in UPPERCASE (e.g., 'EN', 'DE', 'FR'). If the language is unclear, return `null`.
 
 Your response MUST be ONLY the JSON object, with no other text, comments, or explanations.
 
-IF THERE IS NO YEAR IN TEXT OF THE NEWS, THE MONTH AND DATE
 Article to process:
 {article}
-""".strip(),
-        )
-    ]
-)
+"""
+
+
+def _build_prompt(with_date: bool) -> ChatPromptTemplate:
+    text = _PROMPT_HEAD + (_PROMPT_DATE_RULE if with_date else "") + _PROMPT_TAIL
+    return ChatPromptTemplate.from_messages([("system", text.strip())])
+
+
+_prompt = _build_prompt(with_date=True)
+_prompt_no_date = _build_prompt(with_date=False)
 
 # Use function_calling for more robust structured output
-_chain = _prompt | _model.with_structured_output(
+_structured = _model.with_structured_output(
     ArticleNormalizationEntry, method="function_calling"
 )
+_structured_no_date = _model.with_structured_output(
+    ArticleSummaryEntry, method="function_calling"
+)
 
 
-def normalize_article(state: GraphState) -> GraphState:
+async def normalize_article(state: GraphState) -> GraphState:
     print(state)
     # The function now expects 'title' to be in the input state.
     url: str = state["url"]
     title: str = state["title"]
-    article_text: str = state["unstructured_article"]
+    article_text: str = fit_to_budget("normalize_article", state["unstructured_article"])
     raw: str = state["raw"]
     image_url: str = state["image_url"]
     provider: str = state["provider"]
-    # 1) LLM normalization (summary, published_at, lang)
-    norm = _chain.invoke({"article": article_text})
+    published_at = parse_published(state.get("published_at"))
+    # 1) LLM normalization (summary, lang; published_at only when the scraped
+    # date did not parse)
+    if published_at is not None:
+        norm = await ainvoke_cached(
+            _prompt_no_date,
+            _structured_no_date,
+            {"article": article_text},
+            template_id="normalize_article",
+            llm=_model,
+            schema=ArticleSummaryEntry,
+        )
+    else:
+        norm = await ainvoke_cached(
+            _prompt,
+            _structured,
+            {"article": article_text},
+            template_id="normalize_article",
+            llm=_model,
+            schema=ArticleNormalizationEntry,
+        )
+        published_at = as_utc_datetime(norm.published_at)
 
     # 2) Derived fields
     host = urlparse(url).netloc.lower()
@@ -97,9 +132,15 @@ def normalize_article(state: GraphState) -> GraphState:
     raw_hash = simhash64(f"{title or ''} || {norm.summary or ''}")
     hash_64 = to_signed_64(raw_hash)
 
-    # 3) Embedding from title + summary
+    # 3) Embedding from title + summary; the only embedding of this article per
+    # ingest run, carried downstream in article_row["content_emb"]
     combined_text = f"{title or ''}\n\n{norm.summary or ''}"
-    content_emb = embed_text(combined_text) if (title or norm.summary) else None
+    # aembed_text batches concurrent articles into one embeddings request.
+    content_emb = (
+        await aembed_text(combined_text, stage="normalize_article")
+        if (title or norm.summary)
+        else None
+    )
 
     # 4) Final entry
     entry = ArticleEntry(
@@ -109,9 +150,10 @@ def normalize_article(state: GraphState) -> GraphState:
         source_domain=source_domain,
         fetched_at=fetched_at,
         hash_64=hash_64,
+        raw_hash_64=state.get("raw_hash_64"),
         content_emb=content_emb,
         summary=norm.summary,
-        published_at=norm.published_at,
+        published_at=published_at,
         lang=norm.lang,
         provider=provider,
         image_url=image_url,
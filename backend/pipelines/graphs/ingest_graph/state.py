@@ -1,13 +1,19 @@
 from __future__ import annotations
-from typing import TypedDict, Dict, Any, List, Tuple
+from datetime import datetime
+from typing import TypedDict, Dict, Any, List, Optional, Tuple
 
 
 class GraphState(TypedDict):
+    # Per-run db.unit_of_work.UnitOfWork (set by run_ingest)
+    uow: Any
     url: str
     image_url: str
     title: str  # <-- THIS IS THE FIX
     raw: str
+    # UTC publication time parsed from the scraped date, if it resolved
+    published_at: Optional[datetime]
     unstructured_article: str
+    raw_hash_64: int
     article_row: Dict[str, Any]
     insert_status: str
     insert_ref_url: str
@@ -15,6 +21,7 @@ class GraphState(TypedDict):
     insert_metric: Any
     related_articles: List[Dict[str, Any]]
     analysis: Dict[str, Any]
+    analysis_timings: Dict[str, Dict[str, float]]
     verified: bool
     verification_issues: List[str]
     alerted: bool
@@ -3,6 +3,7 @@ from langgraph.types import Send
 from dotenv import load_dotenv
 from backend.pipelines.graphs.web_scrapper_graph.state import InitState, OverallState
 from backend.pipelines.graphs.ingest_graph.state import GraphState
+from backend.services.dates import parse_published
 
 import asyncio
 
@@ -17,7 +18,11 @@ def send_unstructured_articles(state: OverallState):
         text = a.get("main_text") or ""
         if not text.strip():
             continue
+        # Parsed from the scraped date string; normalize_article only asks
+        # the LLM for a date when this is None
+        published_at = a.get("published_at") or parse_published(a.get("date"))
         sends.append(Send("Analyse Posts", {"url": a["url"], "title": a["title"],
-                                            "unstructured_article": a["main_text"], "raw": a["main_text"], "provider": a["provider"], "image_url": a["image_url"]}))
+                                            "unstructured_article": a["main_text"], "raw": a["main_text"], "provider": a["provider"], "image_url": a["image_url"],
+                                            "published_at": published_at}))
 
     return sends
@@ -8,6 +8,7 @@ from backend.pipelines.graphs.web_scrapper_graph.nodes.check_website import chec
 from backend.pipelines.graphs.web_scrapper_graph.nodes.financial_times import get_posts_hardcoded_ft
 from backend.pipelines.graphs.web_scrapper_graph.nodes.cnbc import get_posts_hardcoded_cnbc
 from backend.pipelines.graphs.web_scrapper_graph.nodes.yahoo_finance import get_posts_hardcoded_yahoo
+from backend.pipelines.graphs.web_scrapper_graph.nodes.filter_known_posts import filter_known_posts
 
 
 import json
@@ -24,6 +25,7 @@ builder.add_node("Get Posts Reuters", get_posts_hardcoded)
 builder.add_node("Get Posts CNBC", get_posts_hardcoded_cnbc)
 builder.add_node("Get Posts FT", get_posts_hardcoded_ft)
 builder.add_node("Get Posts Yahoo Finance", get_posts_hardcoded_yahoo)
+builder.add_node("Filter Known Posts", filter_known_posts)
 builder.add_node("Parse Structured Post", parsed_struct_text)
 builder.add_node("Gather all Posts Together", gather_articles)
 
@@ -38,10 +40,11 @@ builder.add_conditional_edges(
         "cnbc": "Get Posts CNBC",
     }
 )
-builder.add_conditional_edges("Get Posts Reuters", send_article, ["Parse Structured Post"])
-builder.add_conditional_edges("Get Posts FT", send_article, ["Parse Structured Post"])
-builder.add_conditional_edges("Get Posts CNBC", send_article, ["Parse Structured Post"])
-builder.add_conditional_edges("Get Posts Yahoo Finance", send_article, ["Parse Structured Post"])
+builder.add_edge("Get Posts Reuters", "Filter Known Posts")
+builder.add_edge("Get Posts FT", "Filter Known Posts")
+builder.add_edge("Get Posts CNBC", "Filter Known Posts")
+builder.add_edge("Get Posts Yahoo Finance", "Filter Known Posts")
+builder.add_conditional_edges("Filter Known Posts", send_article, ["Parse Structured Post"])
 builder.add_edge("Parse Structured Post", "Gather all Posts Together")
 builder.add_edge("Gather all Posts Together", END)
 
@@ -1,58 +1,40 @@
 import asyncio
-import json
-from bs4 import BeautifulSoup
-import feedparser
-import requests
 
 from backend.pipelines.graphs.web_scrapper_graph.state import InitState, OverallState
-
-COOKIES_FILE = "cookies.json"
-
-
-def get_cnbc_articles_with_images(state: InitState):
-    feed = feedparser.parse(state["link"])
-    articles = []
-
-    for entry in feed.entries[1:3]:
-        title = entry.title
-        link = entry.link
-
-        try:
-            resp = requests.get(link, headers={"User-Agent": "Mozilla/5.0"})
-            resp.raise_for_status()
-            soup = BeautifulSoup(resp.text, "html.parser")
-
-            og_img = soup.find("meta", property="og:image")
-            image_url = og_img["content"] if og_img else None
-        except Exception as e:
-            print(f"Ошибка загрузки {link}: {e}")
-            image_url = None
-
-        articles.append({
-            "title": title,
-            "link": link,
-            "image": image_url
-        })
-
-    return articles
-
-
-async def load_cookies():
-    try:
-        with open(COOKIES_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print("No cookies.json found, running without cookies")
-        return None
+from backend.services.feed_poller import get_feed_poller
+from backend.services.page_fetch import fetch_og_image
+from backend.services.url_filter import known_urls
+
+
+async def get_cnbc_articles_with_images(state: InitState):
+    # Conditional GET: an unchanged feed yields nothing
+    poll = await asyncio.to_thread(get_feed_poller().poll, state["link"], start=1, limit=2)
+    if poll.not_modified:
+        print("CNBC RSS: not modified")
+        return []
+
+    # Known URLs are dropped before the per-entry og:image requests
+    entries = [e for e in poll.entries if e.get("link")]
+    known = await known_urls.known(e.link for e in entries)
+    entries = [e for e in entries if e.link not in known]
+    images = await asyncio.gather(*(fetch_og_image(e.link) for e in entries))
+
+    return [
+        {
+            "title": entry.title,
+            "link": entry.link,
+            "image": image_url,
+            "date": entry.get("published"),
+        }
+        for entry, image_url in zip(entries, images)
+    ]
 
 
 async def main(state: InitState) -> OverallState:
-    articles = get_cnbc_articles_with_images(state)
+    articles = await get_cnbc_articles_with_images(state)
     return articles
 
 
-def get_posts_hardcoded_cnbc(state: InitState) -> OverallState:
-    result = asyncio.run(main(state))
+async def get_posts_hardcoded_cnbc(state: InitState) -> OverallState:
+    result = await main(state)
     return {"articles": result, "article_index": 0}
-
-
@@ -0,0 +1,11 @@
+from backend.pipelines.graphs.web_scrapper_graph.state import OverallState
+from backend.services.url_filter import known_urls
+
+
+async def filter_known_posts(state: OverallState) -> OverallState:
+    # Drop listing items already stored before any page fetch or LLM work
+    articles = state.get("articles") or []
+    known = await known_urls.known(a.get("link") for a in articles)
+    fresh = [a for a in articles if a.get("link") not in known]
+    print(f"Filter Known Posts: {len(articles) - len(fresh)} known, {len(fresh)} new")
+    return {"articles": fresh}
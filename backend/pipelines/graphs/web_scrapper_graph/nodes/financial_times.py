@@ -9,13 +9,11 @@ import re
 
 from backend.pipelines.graphs.web_scrapper_graph.state import InitState, OverallState
 
-from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, BrowserConfig
+from backend.services.browser_pool import get_browser_pool
 from langchain_openai import ChatOpenAI
 from PIL import Image
 import re
 
-COOKIES_FILE = "cookies.json"
-
 import re
 
 def parse_ft_markets(md: str):
@@ -55,36 +53,19 @@ def parse_ft_markets(md: str):
     return articles
 
 
-async def load_cookies():
-    try:
-        with open(COOKIES_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print("No cookies.json found, running without cookies")
-        return None
-
 async def main(state: InitState) -> OverallState:
-    cookies = await load_cookies()
-    browser_cfg = BrowserConfig(headless=False, user_agent=(
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) " "AppleWebKit/537.36 (KHTML, like Gecko) " "Chrome/120.0 Safari/537.36"),
-                                cookies=cookies, viewport_width=1920, viewport_height=1080,)
-
-    async with AsyncWebCrawler(config=browser_cfg) as crawler:
-        script = """
-            WAIT 10
-            IF (EXISTS `#onetrust-accept-btn-handler`) THEN CLICK `#onetrust-accept-btn-handler`
-            WAIT 5
-            """
-        run_cfg = CrawlerRunConfig(c4a_script=script, exclude_external_links=True)
-        result = await crawler.arun(url=state["link"], config=run_cfg)
-        print(result.markdown)
-        articles = parse_ft_markets(result.markdown)
-        articles = articles[:2]
-        print(articles)
-        return articles
-
-
-
-def get_posts_hardcoded_ft(state: InitState) -> OverallState:
-    result = asyncio.run(main(state))
+    # parse_ft_markets needs the pager, which renders after the story list
+    result = await get_browser_pool().fetch(
+        state["link"], wait_for="css:a[href*='/content/']", delay_s=1.0
+    )
+    print(result.markdown)
+    articles = parse_ft_markets(result.markdown)
+    articles = articles[:2]
+    print(articles)
+    return articles
+
+
+
+async def get_posts_hardcoded_ft(state: InitState) -> OverallState:
+    result = await main(state)
     return {"articles": result, "article_index": 0}
@@ -9,13 +9,11 @@ import re
 
 from backend.pipelines.graphs.web_scrapper_graph.state import InitState, OverallState
 
-from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, BrowserConfig
+from backend.services.browser_pool import get_browser_pool
 from langchain_openai import ChatOpenAI
 from PIL import Image
 import re
 
-COOKIES_FILE = "cookies.json"
-
 def parse_reuters_news(md: str):
     articles = []
 
@@ -65,37 +63,24 @@ def parse_reuters_markdown(md: str):
         })
     return news
 
-async def load_cookies():
-    try:
-        with open(COOKIES_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print("No cookies.json found, running without cookies")
-        return None
-
-async def main(state: InitState) -> OverallState:
-    cookies = await load_cookies()
-    browser_cfg = BrowserConfig(headless=False, user_agent=(
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) " "AppleWebKit/537.36 (KHTML, like Gecko) " "Chrome/120.0 Safari/537.36"),
-                                cookies=cookies, viewport_width=1920, viewport_height=1080,)
-
-    async with AsyncWebCrawler(config=browser_cfg) as crawler:
-        script = """
-            WAIT 5
-            IF (EXISTS `#onetrust-accept-btn-handler`) THEN CLICK `#onetrust-accept-btn-handler`
-            WAIT 3
-            """
-        run_cfg = CrawlerRunConfig(c4a_script=script, exclude_external_links=True)
-        result = await crawler.arun(url=state["link"], config=run_cfg)
-        articles = parse_reuters_news(result.markdown)
-        articles = articles[:3]
-        return articles
-
+_ARTICLE_LINKS_JS = (
+    "js:() => [...document.querySelectorAll('main a[href]')]"
+    ".some(a => /-\\d{4}-\\d{2}-\\d{2}\\/?$/.test(a.getAttribute('href')))"
+)
 
 
+async def main(state: InitState) -> OverallState:
+    # Listing cards are rendered client-side: wait for article links to appear
+    # (Reuters article URLs end in the publication date, e.g. ...-2025-10-01/)
+    result = await get_browser_pool().fetch(
+        state["link"], wait_for=_ARTICLE_LINKS_JS, delay_s=1.0
+    )
+    articles = parse_reuters_news(result.markdown)
+    articles = articles[:3]
+    return articles
 
 
-def get_posts_hardcoded(state: InitState) -> OverallState:
-    result = asyncio.run(main(state))
+async def get_posts_hardcoded(state: InitState) -> OverallState:
+    result = await main(state)
     return {"articles": result, "article_index": 0}
 
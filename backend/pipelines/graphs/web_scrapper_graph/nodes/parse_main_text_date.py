@@ -14,6 +14,16 @@ from backend.pipelines.graphs.web_scrapper_graph.state import InitState, Overall
 from dotenv import load_dotenv
 
 from backend.utils.helpers import extract_text_inside_tags
+from backend.services.llm_cache import ainvoke_cached
+from backend.services.page_fetch import fetch_page
+from backend.services.token_budget import fit_to_budget
+from backend.services.content_extraction import (
+    CONTENT_EXTRACTION_SKIP_LLM,
+    CONTENT_EXTRACTION_TRIM_LLM,
+    extract_main_content,
+)
+from backend.services.domain_extractors import extraction_stats, extractor_for, provider_for
+from backend.services.dates import parse_published
 
 import asyncio
 import base64
@@ -24,7 +34,6 @@ import time
 
 from backend.pipelines.graphs.web_scrapper_graph.state import InitState, OverallState
 
-from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, BrowserConfig
 from langchain_openai import ChatOpenAI
 from PIL import Image
 import re
@@ -83,57 +92,95 @@ Example:
 </answer>
 """
 
-COOKIES_FILE = "cookies.json"
-
-
-async def load_cookies():
-    try:
-        with open(COOKIES_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print("No cookies.json found, running without cookies")
-        return None
-
-
-async def get_news_text(link):
-    cookies = await load_cookies()
-    browser_cfg = BrowserConfig(headless=False, user_agent=(
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) " "AppleWebKit/537.36 (KHTML, like Gecko) " "Chrome/120.0 Safari/537.36"),
-                                cookies=cookies, viewport_width=1920, viewport_height=1080, )
-
-    async with AsyncWebCrawler(config=browser_cfg) as crawler:
-        script = """
-                    WAIT 5
-                    IF (EXISTS `#onetrust-accept-btn-handler`) THEN CLICK `#onetrust-accept-btn-handler`
-                    WAIT 3
-                """
-        run_cfg = CrawlerRunConfig(c4a_script=script, exclude_external_links=True)
-        result = await crawler.arun(url=link, config=run_cfg)
-        return result.markdown
-
-
-def parsed_struct_text(state: SubState) -> OverallState:
+# Used when the listing date already parsed: the LLM is not asked for a date
+SYSTEM_PROMPT_NO_DATE = re.sub(
+    r'^\s*(?:"date": .*|- date: .*)\n', "", SYSTEM_PROMPT, flags=re.MULTILINE
+)
+
+def deterministic_article(article: dict, main_text: str) -> dict:
+    """The dict the structuring LLM would return, built from listing metadata."""
+    return {
+        "url": article["link"],
+        # ArticleEntry.image_url is a str; the LLM path returns "" when absent
+        "image_url": article.get("image") or "",
+        "provider": provider_for(article["link"]),
+        "title": article["title"],
+        "date": article.get("date"),
+        "main_text": main_text,
+    }
+
+
+def _with_published_at(parsed: dict, published_at) -> dict:
+    """Adds the UTC publication time: the listing date, else the extracted one."""
+    parsed["published_at"] = published_at or parse_published(parsed.get("date"))
+    return parsed
+
+
+async def parsed_struct_text(state: SubState) -> OverallState:
+    article = state["article"]
+    if isinstance(article, dict) and "main_text" not in article:
+        # Each Send fetches its own page under the global / per-domain limits,
+        # so parsing starts as soon as this page arrives
+        main_text = await fetch_page(article["link"], article.get("title"))
+        if not main_text:
+            print(f"Parse Structured Post: skipping {article['link']}, page fetch failed")
+            return {"new_articles": []}
+        article = {**article, "main_text": main_text}
+    link = article.get("link") if isinstance(article, dict) else None
+    published_at = parse_published(article.get("date")) if isinstance(article, dict) else None
+    if isinstance(article, dict) and article.get("main_text"):
+        # Site rules first: they also know the source's date format and paywall
+        extractor = extractor_for(link)
+        parsed = extractor.extract(article) if extractor else None
+        if parsed is not None:
+            extraction_stats.record(link, "rule")
+            return {"new_articles": [_with_published_at(parsed, published_at)]}
+
+        extraction = extract_main_content(article["main_text"], article.get("title"))
+        if (
+            extraction.confidence >= CONTENT_EXTRACTION_SKIP_LLM
+            and article.get("title")
+            and link
+        ):
+            # Body found with high confidence: no LLM call at all
+            extraction_stats.record(link, "generic")
+            parsed = deterministic_article(article, extraction.main_text)
+            return {"new_articles": [_with_published_at(parsed, published_at)]}
+        if extraction.confidence >= CONTENT_EXTRACTION_TRIM_LLM:
+            # The LLM only sees the extracted body, not the page chrome
+            article = {**article, "main_text": extraction.main_text}
+
+    if link:
+        extraction_stats.record(link, "llm")
     model = ChatOpenAI(model="gpt-4o")
     for attempt in range(1, MAX_ATTEMPTS + 1):
         try:
-            # article_parsed = asyncio.run(get_news_text(state["article"]["link"]))
-            # state["article"]["main_text"] = article_parsed
-            article_text = (
-                state["article"]
-                if isinstance(state["article"], str)
-                else json.dumps(state["article"], ensure_ascii=False)
-            )
+            if isinstance(article, str):
+                article_text = fit_to_budget("parsed_struct_text", article)
+            else:
+                # Budget the scraped page body; the listing metadata stays whole
+                budgeted = {
+                    **article,
+                    "main_text": fit_to_budget("parsed_struct_text", article.get("main_text") or ""),
+                }
+                article_text = json.dumps(budgeted, ensure_ascii=False)
             message = HumanMessage(content=article_text)
 
             # Create message and prompt chain
             assistant_prompt = ChatPromptTemplate.from_messages([
-                ('system', SYSTEM_PROMPT),
+                ('system', SYSTEM_PROMPT_NO_DATE if published_at else SYSTEM_PROMPT),
                 message
             ])
 
-            # Invoke the model
-            assistant_chain = assistant_prompt | model
-            raw_response = assistant_chain.invoke({})
+            # Invoke the model; retries bypass the cached (unusable) answer
+            raw_response = await ainvoke_cached(
+                assistant_prompt,
+                model,
+                {},
+                template_id="parsed_struct_text",
+                llm=model,
+                refresh=attempt > 1,
+            )
 
             # Extract hypothesis and validate
             answer = extract_text_inside_tags(raw_response.content, "answer")
@@ -144,8 +191,10 @@ def parsed_struct_text(state: SubState) -> OverallState:
                 answer_dict = json.loads(answer)
             except json.JSONDecodeError as je:
                 raise ValueError(f"Failed to parse JSON from answer: {je}")
+            if published_at:
+                answer_dict["date"] = article.get("date")
             result_state = {
-                "new_articles": [answer_dict],
+                "new_articles": [_with_published_at(answer_dict, published_at)],
             }
 
             return result_state
@@ -1,9 +1,9 @@
 import json
 import re
 from bs4 import BeautifulSoup
-import feedparser
 
 from backend.pipelines.graphs.web_scrapper_graph.state import InitState, OverallState
+from backend.services.feed_poller import get_feed_poller
 
 
 def parse_yahoo_finance_news(html_content: str):
@@ -95,10 +95,14 @@ def scrape_yahoo_finance_rss() -> list:
         # RSS feed URL
         rss_url = "https://finance.yahoo.com/news/rssindex"
 
-        feed = feedparser.parse(rss_url)
+        # Conditional GET: an unchanged feed is not downloaded again; entries
+        # already stored are dropped by the Filter Known Posts node
+        poll = get_feed_poller().poll(rss_url, limit=3)
+        if poll.not_modified:
+            print("Yahoo Finance RSS: not modified")
         articles = []
 
-        for entry in feed.entries[:3]:
+        for entry in poll.entries:
             title = entry.title
             link = entry.link
 
@@ -21,6 +21,9 @@ class OverallState(TypedDict):
 
 class OutputState(TypedDict):
     placeholder: Annotated[list[dict], operator.add]
+    # Articles parsed this run (known URLs are filtered out before parsing);
+    # the scheduler adapts each source's interval to how many there were
+    new_articles: Annotated[list[dict], operator.add]
 
 
 class SubState(TypedDict):
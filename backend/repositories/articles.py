@@ -1,58 +1,66 @@
 from __future__ import annotations
 
 from datetime import timedelta
-from typing import Optional, Tuple, Union
+from typing import List, Optional, Tuple, Union
 
-from sqlalchemy import select, desc, bindparam, cast, literal
+import numpy as np
+from sqlalchemy import select, desc, bindparam, cast, literal, or_, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from backend.db.session import AsyncSessionLocal
 
 from backend.db.session import SessionLocal
 from backend.db.models import Article
 from backend.db.types import Vector1536
-from backend.services.dedup import hamming_distance
-from backend.services.embeddings import embed_text
+from backend.db.unit_of_work import on_commit
+from backend.services.dedup import hamming_matrix, simhash_bands
+from backend.services.embeddings import aembed_text, aembed_texts
+from backend.services.url_filter import known_urls
+from backend.services.vector_index import RecentVectorIndex
 from backend.utils.helpers import utcnow, to_int
 
+# Must stay below SIMHASH_BANDS for the band lookup to find every match
 HAMMING_THRESHOLD = 3
 EMBED_SIM_THRESHOLD = 0.92
 LOOKBACK_DAYS = 7
+# Band lookups are indexed, so the SimHash window can be much longer than
+# the semantic one without insert latency growing with it.
+SIMHASH_LOOKBACK_DAYS = 180
 MAX_CANDIDATES = 2000
 TOPK_EMB = 10
 
+# Recent-window ANN index for this worker, warmed at startup; DB queries are the
+# fallback until then
+recent_index = RecentVectorIndex(window_s=LOOKBACK_DAYS * 86400)
 
-async def _fetch_recent_hashes(session: Session):
-    cutoff = utcnow() - timedelta(days=LOOKBACK_DAYS)
-    stmt = (
-        select(Article.url, Article.hash_64)
-        .where(Article.fetched_at >= cutoff, Article.hash_64.isnot(None))
-        .order_by(desc(Article.fetched_at))
-        .limit(MAX_CANDIDATES)
-    )
-    result = await session.execute(stmt)
-    return result.all()
+SIMHASH_BAND_COLUMNS = (
+    Article.simhash_band_0,
+    Article.simhash_band_1,
+    Article.simhash_band_2,
+    Article.simhash_band_3,
+)
 
 
-async def _find_near_duplicate_simhash(
-    session: Session, new_hash: int
-) -> Optional[Tuple[str, int]]:
-    for url, h in await _fetch_recent_hashes(session):
-        existing = to_int(h)
-        if existing is None:
-            continue
-        dist = hamming_distance(
-            new_hash & 0xFFFFFFFFFFFFFFFF, existing & 0xFFFFFFFFFFFFFFFF
-        )
-        if dist <= HAMMING_THRESHOLD:
-            return (url, dist)
-    return None
+RAW_SIMHASH_BAND_COLUMNS = (
+    Article.raw_simhash_band_0,
+    Article.raw_simhash_band_1,
+    Article.raw_simhash_band_2,
+    Article.raw_simhash_band_3,
+)
 
 
-async def _find_semantic_duplicate_db(
-    session: Session, combined_text: str
-) -> Optional[Tuple[str, float]]:
-    emb = embed_text(combined_text)
+def simhash_band_values(hash_64: int, columns=SIMHASH_BAND_COLUMNS) -> dict:
+    """Column values for the SimHash band index of an article row."""
+    return {
+        col.key: band
+        for col, band in zip(columns, simhash_bands(hash_64))
+    }
+
+
+def semantic_neighbours_stmt():
+    """Top-k recent articles by cosine similarity to the `emb` bind parameter."""
     cutoff = utcnow() - timedelta(days=LOOKBACK_DAYS)
 
     distance = Article.content_emb.op("<=>")(cast(bindparam("emb"), Vector1536()))
@@ -69,61 +77,446 @@ async def _find_semantic_duplicate_db(
         .order_by(distance)
         .limit(TOPK_EMB)
     )
+    return stmt
+
 
-    # emb_str = "[" + ",".join(f"{x:.6f}" for x in emb) + "]"
-    result = await session.execute(stmt, {"emb": emb})
+async def _find_semantic_duplicate_db(
+    session: Session, emb: List[float]
+) -> Optional[Tuple[str, float, Optional[int]]]:
+    """Returns (url, similarity, article id if known) of the best match over the threshold."""
+    if recent_index.ready:
+        hits = recent_index.search(emb, k=1, max_age_s=LOOKBACK_DAYS * 86400)
+        if hits and hits[0][0] >= EMBED_SIM_THRESHOLD:
+            sim, meta = hits[0]
+            return (meta["url"], sim, meta.get("id"))
+        return None
+
+    result = await session.execute(semantic_neighbours_stmt(), {"emb": emb})
     rows = result.fetchall()
     if not rows:
         return None
     best_url, best_sim = rows[0][0], float(rows[0][1])
     if best_sim >= EMBED_SIM_THRESHOLD:
-        return (best_url, best_sim)
+        return (best_url, best_sim, None)
     return None
 
 
+def _index_meta(row) -> dict:
+    return {
+        "id": row["id"],
+        "url": row["url"],
+        "title": row["title"],
+        "summary": row["summary"],
+        "published_at": row["published_at"],
+        "source_domain": row["source_domain"],
+    }
+
+
+async def warm_recent_index() -> int:
+    """Load the recent-article window into recent_index; returns the row count."""
+    cutoff = utcnow() - timedelta(days=LOOKBACK_DAYS)
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(
+                Article.id,
+                Article.url,
+                Article.title,
+                Article.summary,
+                Article.published_at,
+                Article.source_domain,
+                Article.fetched_at,
+                Article.content_emb,
+            )
+            .where(Article.content_emb.isnot(None), Article.fetched_at >= cutoff)
+            .order_by(Article.fetched_at)
+        )
+        for row in result.mappings():
+            recent_index.add(row["content_emb"], _index_meta(row), row["fetched_at"])
+    recent_index.ready = True
+    return len(recent_index)
+
+
+# Columns written by the dedup-and-insert statement (everything but the PK)
+_INSERT_COLUMNS = (
+    "url", "source_domain", "raw", "title", "summary", "published_at", "fetched_at",
+    "lang", "hash_64", "content_emb", "provider", "image_url",
+    "simhash_band_0", "simhash_band_1", "simhash_band_2", "simhash_band_3",
+    "raw_hash_64",
+    "raw_simhash_band_0", "raw_simhash_band_1", "raw_simhash_band_2", "raw_simhash_band_3",
+)
+_INSERT_COLUMNS_SQL = ", ".join(_INSERT_COLUMNS)
+_INSERT_VALUES_SQL = ", ".join(
+    "CAST(:content_emb AS vector(1536))" if c == "content_emb" else f":{c}"
+    for c in _INSERT_COLUMNS
+)
+
+# SimHash check, semantic nearest neighbour and conditional insert in one
+# server-side statement. The semantic CTE is skipped once a SimHash duplicate
+# is found, and the insert only runs when neither check matched.
+_DEDUP_INSERT_SQL = text(
+    f"""
+    WITH simhash_dup AS (
+        SELECT url, bit_count((hash_64::bigint # CAST(:hash_64 AS bigint))::bit(64)) AS dist
+        FROM articles
+        WHERE CAST(:hash_64 AS bigint) IS NOT NULL
+          AND fetched_at >= :simhash_cutoff
+          AND (simhash_band_0 = :simhash_band_0 OR simhash_band_1 = :simhash_band_1
+               OR simhash_band_2 = :simhash_band_2 OR simhash_band_3 = :simhash_band_3)
+          AND bit_count((hash_64::bigint # CAST(:hash_64 AS bigint))::bit(64)) <= :hamming_threshold
+        ORDER BY fetched_at DESC
+        LIMIT 1
+    ),
+    semantic_dup AS (
+        SELECT id, url, 1 - (content_emb <=> CAST(:content_emb AS vector(1536))) AS sim
+        FROM articles
+        WHERE :check_semantic
+          AND CAST(:content_emb AS vector(1536)) IS NOT NULL
+          AND content_emb IS NOT NULL
+          AND fetched_at >= :semantic_cutoff
+          AND NOT EXISTS (SELECT 1 FROM simhash_dup)
+        ORDER BY content_emb <=> CAST(:content_emb AS vector(1536))
+        LIMIT 1
+    ),
+    ins AS (
+        INSERT INTO articles ({_INSERT_COLUMNS_SQL})
+        SELECT {_INSERT_VALUES_SQL}
+        WHERE NOT EXISTS (SELECT 1 FROM simhash_dup)
+          AND NOT EXISTS (SELECT 1 FROM semantic_dup WHERE sim >= :sim_threshold)
+        ON CONFLICT (url) DO NOTHING
+        RETURNING id
+    )
+    SELECT 'duplicate' AS status, url AS ref_url, dist::float8 AS metric, NULL::integer AS article_id
+    FROM simhash_dup
+    UNION ALL
+    SELECT 'semantic-duplicate', url, sim, id FROM semantic_dup WHERE sim >= :sim_threshold
+    UNION ALL
+    SELECT 'inserted', NULL, NULL, id FROM ins
+    """
+).bindparams(bindparam("content_emb", type_=Vector1536()))
+
+
+def _prepare_row(article_row: dict) -> Optional[int]:
+    """Fill derived insert columns in place; returns the SimHash as int."""
+    new_hash = to_int(article_row.get("hash_64"))
+    if new_hash is not None:
+        article_row.update(simhash_band_values(new_hash))
+    raw_hash = to_int(article_row.get("raw_hash_64"))
+    if raw_hash is not None:
+        article_row.update(simhash_band_values(raw_hash, RAW_SIMHASH_BAND_COLUMNS))
+    article_row.setdefault("fetched_at", utcnow())
+    return new_hash
+
+
+# Pre-normalization gate: exact URL, or a near-duplicate SimHash of the raw
+# title + text, against stored articles. Runs before any LLM or embedding call.
+_KNOWN_ARTICLE_SQL = text(
+    """
+    (SELECT 'exists' AS status, url AS ref_url, NULL::float8 AS metric
+     FROM articles WHERE url = :url)
+    UNION ALL
+    (SELECT 'duplicate', url,
+            bit_count((raw_hash_64::bigint # CAST(:raw_hash_64 AS bigint))::bit(64))::float8
+     FROM articles
+     WHERE fetched_at >= :cutoff
+       AND (raw_simhash_band_0 = :band_0 OR raw_simhash_band_1 = :band_1
+            OR raw_simhash_band_2 = :band_2 OR raw_simhash_band_3 = :band_3)
+       AND bit_count((raw_hash_64::bigint # CAST(:raw_hash_64 AS bigint))::bit(64)) <= :hamming_threshold
+     ORDER BY fetched_at DESC
+     LIMIT 1)
+    LIMIT 1
+    """
+)
+
+
+async def find_known_article(
+    url: str, raw_hash_64: int, session: Optional[AsyncSession] = None
+) -> Optional[Tuple[str, str, Optional[int]]]:
+    """
+    (status, ref_url, hamming distance) when the article is already stored:
+    "exists" for the same URL, "duplicate" for a near-identical raw text.
+    """
+    params = {f"band_{i}": b for i, b in enumerate(simhash_bands(raw_hash_64))}
+    params.update(
+        url=url,
+        raw_hash_64=raw_hash_64,
+        cutoff=utcnow() - timedelta(days=SIMHASH_LOOKBACK_DAYS),
+        hamming_threshold=HAMMING_THRESHOLD,
+    )
+    if session is not None:
+        row = (await session.execute(_KNOWN_ARTICLE_SQL, params)).mappings().first()
+    else:
+        async with AsyncSessionLocal() as session:
+            row = (await session.execute(_KNOWN_ARTICLE_SQL, params)).mappings().first()
+    if row is None:
+        return None
+    metric = int(row["metric"]) if row["metric"] is not None else None
+    return (row["status"], row["ref_url"], metric)
+
+
+def _combined_text(article_row: dict) -> str:
+    return f"{article_row.get('title') or ''}\n\n{article_row.get('summary') or ''}"
+
+
 async def insert_article(
     article_row: dict,
+    session: Optional[AsyncSession] = None,
 ) -> Tuple[str, Optional[str], Optional[Union[int, float]], Optional[int]]:
     """
-    Returns: (status, ref_url, metric)
+    Returns: (status, ref_url, metric, article_id)
       status in {"inserted", "duplicate", "semantic-duplicate", "exists"}
       metric: hamming distance (int) or similarity (float)
+    With `session` (a unit of work) the insert joins the caller's transaction
+    and is committed by the caller; otherwise it commits on its own.
+    """
+    new_hash = _prepare_row(article_row)
+    combined = _combined_text(article_row)
+    if article_row.get("content_emb") is None and combined.strip():
+        article_row["content_emb"] = await aembed_text(combined, stage="insert_article")
+
+    if session is not None:
+        return await _dedup_insert(session, article_row, new_hash)
+    async with AsyncSessionLocal() as session:
+        result = await _dedup_insert(session, article_row, new_hash)
+        await session.commit()
+    return result
+
+
+async def _dedup_insert(
+    session: AsyncSession, article_row: dict, new_hash: Optional[int]
+) -> Tuple[str, Optional[str], Optional[Union[int, float]], Optional[int]]:
+    # A warm in-process index answers the semantic check without the DB;
+    # the statement below then only runs the SimHash check and the insert.
+    check_semantic = True
+    if recent_index.ready and article_row.get("content_emb") is not None:
+        check_semantic = False
+        sem = await _find_semantic_duplicate_db(session, article_row["content_emb"])
+        if sem:
+            dup_url, sim, article_id = sem
+            return ("semantic-duplicate", dup_url, sim, article_id)
+
+    now = utcnow()
+    params = {c: article_row.get(c) for c in _INSERT_COLUMNS}
+    params.update(
+        hash_64=new_hash,
+        check_semantic=check_semantic,
+        simhash_cutoff=now - timedelta(days=SIMHASH_LOOKBACK_DAYS),
+        semantic_cutoff=now - timedelta(days=LOOKBACK_DAYS),
+        hamming_threshold=HAMMING_THRESHOLD,
+        sim_threshold=EMBED_SIM_THRESHOLD,
+    )
+    try:
+        # Savepoint: a failed insert must not abort the caller's transaction
+        async with session.begin_nested():
+            rows = (await session.execute(_DEDUP_INSERT_SQL, params)).mappings().all()
+    except IntegrityError:
+        return ("exists", None, None, None)
+
+    if not rows:
+        # URL already stored (ON CONFLICT DO NOTHING)
+        return ("exists", None, None, None)
+    row = rows[0]
+    if row["status"] == "duplicate":
+        return ("duplicate", row["ref_url"], int(row["metric"]), None)
+    if row["status"] == "semantic-duplicate":
+        return ("semantic-duplicate", row["ref_url"], float(row["metric"]), row["article_id"])
+
+    article_id = row["article_id"]
+
+    def _publish():
+        # In-process structures only learn about the row once it is committed
+        known_urls.add(article_row["url"])
+        if article_row.get("content_emb") is not None:
+            recent_index.add(
+                article_row["content_emb"],
+                _index_meta({**article_row, "id": article_id}),
+                article_row["fetched_at"],
+            )
+
+    on_commit(session, _publish)
+    return ("inserted", None, None, article_id)
+
+
+# ---------- Bulk ingest ----------
+async def _find_simhash_duplicates_batch(
+    session: Session, hashes: List[Optional[int]]
+) -> List[Optional[Tuple[str, int]]]:
+    """Per input hash: (url, distance) of the newest stored near-duplicate, one query for all."""
+    known = [h for h in hashes if h is not None]
+    if not known:
+        return [None] * len(hashes)
+    bands = [simhash_bands(h) for h in known]
+    same_band = [
+        col.in_(sorted({b[i] for b in bands}))
+        for i, col in enumerate(SIMHASH_BAND_COLUMNS)
+    ]
+    cutoff = utcnow() - timedelta(days=SIMHASH_LOOKBACK_DAYS)
+    rows = (
+        await session.execute(
+            select(Article.url, Article.hash_64)
+            .where(
+                Article.fetched_at >= cutoff,
+                Article.hash_64.isnot(None),
+                or_(*same_band),
+            )
+            .order_by(desc(Article.fetched_at))
+        )
+    ).all()
+    if not rows:
+        return [None] * len(hashes)
+
+    dists = hamming_matrix(known, [to_int(h) for _, h in rows])
+    found = []
+    for d in dists:
+        hits = (d <= HAMMING_THRESHOLD).nonzero()[0]
+        found.append((rows[hits[0]][0], int(d[hits[0]])) if hits.size else None)
+    it = iter(found)
+    return [next(it) if h is not None else None for h in hashes]
+
+
+async def _find_semantic_duplicates_batch(
+    session: Session, embs: List[Optional[object]]
+) -> List[Optional[Tuple[str, float, Optional[int]]]]:
+    """Per input embedding: best stored match over the threshold, one query for all."""
+    if recent_index.ready:
+        return [
+            await _find_semantic_duplicate_db(session, e) if e is not None else None
+            for e in embs
+        ]
+
+    idx = [i for i, e in enumerate(embs) if e is not None]
+    if not idx:
+        return [None] * len(embs)
+    values = ", ".join(f"({i}, CAST(:emb_{i} AS vector(1536)))" for i in idx)
+    stmt = text(
+        f"""
+        SELECT q.i, nn.id, nn.url, nn.sim
+        FROM (VALUES {values}) AS q(i, emb)
+        CROSS JOIN LATERAL (
+            SELECT id, url, 1 - (content_emb <=> q.emb) AS sim
+            FROM articles
+            WHERE content_emb IS NOT NULL AND fetched_at >= :cutoff
+            ORDER BY content_emb <=> q.emb
+            LIMIT 1
+        ) nn
+        """
+    ).bindparams(*(bindparam(f"emb_{i}", type_=Vector1536()) for i in idx))
+    params = {f"emb_{i}": embs[i] for i in idx}
+    params["cutoff"] = utcnow() - timedelta(days=LOOKBACK_DAYS)
+    found: List[Optional[Tuple[str, float, Optional[int]]]] = [None] * len(embs)
+    for row in (await session.execute(stmt, params)).mappings():
+        if float(row["sim"]) >= EMBED_SIM_THRESHOLD:
+            found[row["i"]] = (row["url"], float(row["sim"]), row["id"])
+    return found
+
+
+async def insert_articles(
+    article_rows: List[dict],
+) -> List[Tuple[str, Optional[str], Optional[Union[int, float]], Optional[int]]]:
     """
+    Bulk variant of insert_article for backfills and multi-item polls. Rows are
+    deduplicated against the DB and against earlier rows of the same batch, and
+    survivors are written with one multi-row INSERT ... ON CONFLICT DO NOTHING.
+    Returns one (status, ref_url, metric, article_id) per input row, in order.
+    """
+    n = len(article_rows)
+    if n == 0:
+        return []
+    hashes = [_prepare_row(r) for r in article_rows]
+    missing = [
+        i for i, r in enumerate(article_rows)
+        if r.get("content_emb") is None and _combined_text(r).strip()
+    ]
+    if missing:
+        vectors = await aembed_texts(
+            [_combined_text(article_rows[i]) for i in missing], stage="insert_articles"
+        )
+        for i, vec in zip(missing, vectors):
+            article_rows[i]["content_emb"] = vec
+
+    # In-batch similarity: pairwise Hamming distances and cosine similarities
+    batch_hashes = [h if h is not None else 0 for h in hashes]
+    batch_dists = hamming_matrix(batch_hashes, batch_hashes)
+    has_emb = [r.get("content_emb") is not None for r in article_rows]
+    dim = next((len(r["content_emb"]) for i, r in enumerate(article_rows) if has_emb[i]), 1)
+    emb_matrix = np.zeros((n, dim), dtype=np.float32)
+    for i, r in enumerate(article_rows):
+        if has_emb[i]:
+            emb_matrix[i] = np.asarray(r["content_emb"], dtype=np.float32)
+    norms = np.linalg.norm(emb_matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    emb_matrix /= norms
+    batch_sims = emb_matrix @ emb_matrix.T
+
+    results: List[Optional[tuple]] = [None] * n
+    # In-batch semantic duplicates resolve to their survivor's id after the insert
+    survivor_of: dict = {}
+    survivors: List[int] = []
+    seen_urls: dict = {}
+
     async with AsyncSessionLocal() as session:
-        try:
-            # 1) SimHash near-dup
-            new_hash = to_int(article_row.get("hash_64"))
-            if new_hash is not None:
-                hit = await _find_near_duplicate_simhash(session, new_hash)
-                if hit:
-                    dup_url, dist = hit
-                    return ("duplicate", dup_url, dist, None)
-
-            # 2) Semantic dup via embeddings
-            combined = (
-                f"{article_row.get('title') or ''}\n\n{article_row.get('summary') or ''}"
+        db_simhash = await _find_simhash_duplicates_batch(session, hashes)
+        db_semantic = await _find_semantic_duplicates_batch(
+            session, [r.get("content_emb") for r in article_rows]
+        )
+
+        for i, row in enumerate(article_rows):
+            if row["url"] in seen_urls:
+                results[i] = ("exists", None, None, None)
+                continue
+            if db_simhash[i]:
+                url, dist = db_simhash[i]
+                results[i] = ("duplicate", url, dist, None)
+                continue
+            if db_semantic[i]:
+                results[i] = ("semantic-duplicate",) + db_semantic[i]
+                continue
+            near = [
+                j for j in survivors
+                if hashes[i] is not None and hashes[j] is not None
+                and batch_dists[i, j] <= HAMMING_THRESHOLD
+            ]
+            if near:
+                j = near[0]
+                results[i] = ("duplicate", article_rows[j]["url"], int(batch_dists[i, j]), None)
+                continue
+            similar = [
+                j for j in survivors
+                if has_emb[i] and has_emb[j] and batch_sims[i, j] >= EMBED_SIM_THRESHOLD
+            ]
+            if similar:
+                j = max(similar, key=lambda j: batch_sims[i, j])
+                survivor_of[i] = j
+                results[i] = (
+                    "semantic-duplicate", article_rows[j]["url"], float(batch_sims[i, j]), None
+                )
+                continue
+            survivors.append(i)
+            seen_urls[row["url"]] = i
+
+        inserted_ids: dict = {}
+        if survivors:
+            stmt = (
+                pg_insert(Article)
+                .values([{c: article_rows[i].get(c) for c in _INSERT_COLUMNS} for i in survivors])
+                .on_conflict_do_nothing(index_elements=[Article.url])
+                .returning(Article.id, Article.url)
+            )
+            inserted_ids = {url: id_ for id_, url in (await session.execute(stmt)).all()}
+        await session.commit()
+
+    for i in survivors:
+        row = article_rows[i]
+        article_id = inserted_ids.get(row["url"])
+        if article_id is None:
+            results[i] = ("exists", None, None, None)
+            continue
+        results[i] = ("inserted", None, None, article_id)
+        known_urls.add(row["url"])
+        if row.get("content_emb") is not None:
+            recent_index.add(
+                row["content_emb"], _index_meta({**row, "id": article_id}), row["fetched_at"]
             )
-            if combined.strip():
-                sem = await _find_semantic_duplicate_db(session, combined)
-                if sem:
-                    dup_url, sim = sem
-                    stmt = select(Article.id).where(Article.url == dup_url)
-                    res = await session.execute(stmt)
-                    article_id = res.scalar_one_or_none()
-                    return ("semantic-duplicate", dup_url, sim, article_id)
-
-                # 3) Store embedding if missing
-                if "content_emb" not in article_row or article_row["content_emb"] is None:
-                    article_row["content_emb"] = embed_text(combined)
-
-            # 4) Insert (PK url prevents exact dup)
-            article = Article(**article_row)
-            session.add(article)
-            await session.flush()
-            article_id = article.id
-            await session.commit()
-            return ("inserted", None, None, article_id)
-
-        except IntegrityError:
-            await session.rollback()
-            return ("exists", None, None, None)
+    for i, j in survivor_of.items():
+        status, ref_url, sim, _ = results[i]
+        results[i] = (status, ref_url, sim, inserted_ids.get(article_rows[j]["url"]))
+    return results
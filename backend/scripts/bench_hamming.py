@@ -0,0 +1,38 @@
+# scripts/bench_hamming.py
+# Micro-benchmark: per-pair hamming_distance loop vs the vectorized hamming_matrix.
+# Run: python -m backend.scripts.bench_hamming [n_queries] [n_candidates]
+import random
+import sys
+import timeit
+
+import numpy as np
+
+from backend.services.dedup import hamming_distance, hamming_matrix, to_uint64_array
+
+
+def per_pair(queries, candidates):
+    return [[hamming_distance(q, c) for c in candidates] for q in queries]
+
+
+def main(n_queries: int = 50, n_candidates: int = 20000, repeat: int = 3):
+    rng = random.Random(0)
+    queries = [rng.getrandbits(64) for _ in range(n_queries)]
+    candidates = [rng.getrandbits(64) for _ in range(n_candidates)]
+    cand_arr = to_uint64_array(candidates)
+
+    expected = np.array(per_pair(queries[:2], candidates), dtype=np.uint8)
+    assert (hamming_matrix(queries[:2], cand_arr) == expected).all()
+
+    t_loop = min(timeit.repeat(lambda: per_pair(queries, candidates), number=1, repeat=repeat))
+    t_vec = min(timeit.repeat(lambda: hamming_matrix(queries, cand_arr), number=1, repeat=repeat))
+
+    pairs = n_queries * n_candidates
+    kernel = "bitwise_count" if hasattr(np, "bitwise_count") else "byte table"
+    print(f"{n_queries} x {n_candidates} = {pairs} pairs (numpy {np.__version__}, {kernel})")
+    print(f"  per-pair loop : {t_loop * 1e3:9.2f} ms  ({t_loop / pairs * 1e9:7.1f} ns/pair)")
+    print(f"  hamming_matrix: {t_vec * 1e3:9.2f} ms  ({t_vec / pairs * 1e9:7.1f} ns/pair)")
+    print(f"  speedup       : {t_loop / t_vec:9.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
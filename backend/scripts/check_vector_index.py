@@ -0,0 +1,39 @@
+# scripts/check_vector_index.py
+# Verifies that semantic dedup uses the HNSW index instead of a sequential scan.
+# Run: python -m backend.scripts.check_vector_index
+import asyncio
+import sys
+
+import numpy as np
+from sqlalchemy import select
+
+from backend.db.models import Article
+from backend.db.schema import (
+    explain_plan,
+    plan_uses_vector_index,
+    set_vector_search_params,
+)
+from backend.db.session import SessionLocal
+from backend.repositories.articles import semantic_neighbours_stmt
+
+
+async def main() -> bool:
+    async with SessionLocal() as session:
+        probe = (
+            await session.execute(
+                select(Article.content_emb).where(Article.content_emb.isnot(None)).limit(1)
+            )
+        ).scalar_one_or_none()
+        if probe is None:
+            probe = np.full(1536, 1 / np.sqrt(1536), dtype=np.float32)
+
+        await set_vector_search_params(session)
+        plan = await explain_plan(session, semantic_neighbours_stmt(), {"emb": probe})
+        print("\n".join(plan))
+        ok = plan_uses_vector_index(plan)
+        print("\nvector index used:", "yes" if ok else "NO (sequential scan)")
+        return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(main()) else 1)
@@ -0,0 +1,17 @@
+# scripts/rebuild_vector_index.py
+# Rebuilds the HNSW index when PGVECTOR_HNSW_M / PGVECTOR_HNSW_EF_CONSTRUCTION
+# changed. The new index is built concurrently and swapped in.
+# Run: python -m backend.scripts.rebuild_vector_index
+import asyncio
+
+from backend.db.schema import ensure_vector_index
+from backend.db.session import engine
+
+
+async def main() -> None:
+    await ensure_vector_index(engine, rebuild=True)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
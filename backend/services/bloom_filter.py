@@ -0,0 +1,103 @@
+# services/bloom_filter.py
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import struct
+import time
+from typing import List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+# magic, bits, hashes, items, built_at
+_HEADER = struct.Struct("<4sQIQd")
+_MAGIC = b"BLM1"
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form for membership: lowercase host, no fragment, no tracking params."""
+    parts = urlsplit((url or "").strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(
+        [(k, v) for k, v in parse_qsl(parts.query) if not k.lower().startswith("utm_")]
+    )
+    return urlunsplit((parts.scheme.lower(), host, parts.path.rstrip("/"), query, ""))
+
+
+def _hash_pairs(urls: List[str]) -> np.ndarray:
+    """Two independent 64-bit hashes per URL, shape (n, 2), for double hashing."""
+    buf = b"".join(
+        hashlib.blake2b(normalize_url(u).encode("utf-8"), digest_size=16).digest()
+        for u in urls
+    )
+    return np.frombuffer(buf, dtype="<u8").reshape(-1, 2)
+
+
+class BloomFilter:
+    """Bit-array Bloom filter over normalized URLs; no false negatives."""
+
+    def __init__(self, n_bits: int, n_hashes: int, built_at: Optional[float] = None):
+        self.n_bits = n_bits
+        self.n_hashes = n_hashes
+        self.bits = np.zeros((n_bits + 7) // 8, dtype=np.uint8)
+        self.items = 0
+        self.built_at = built_at or time.time()
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = 0.001):
+        n_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        n_hashes = max(1, round(n_bits / capacity * math.log(2)))
+        return cls(n_bits, n_hashes)
+
+    def _positions(self, urls: List[str]) -> np.ndarray:
+        h = _hash_pairs(urls)
+        steps = np.arange(self.n_hashes, dtype=np.uint64)
+        # uint64 arithmetic wraps, which is fine for hashing
+        return (h[:, :1] + steps * (h[:, 1:] | np.uint64(1))) % np.uint64(self.n_bits)
+
+    def add_many(self, urls: List[str]) -> None:
+        if not urls:
+            return
+        pos = self._positions(urls).ravel()
+        masks = (1 << (pos & np.uint64(7))).astype(np.uint8)
+        np.bitwise_or.at(self.bits, pos >> np.uint64(3), masks)
+        self.items += len(urls)
+
+    def contains_many(self, urls: List[str]) -> np.ndarray:
+        if not urls:
+            return np.zeros(0, dtype=bool)
+        pos = self._positions(urls)
+        hit = (self.bits[pos >> np.uint64(3)] >> (pos & np.uint64(7)).astype(np.uint8)) & 1
+        return hit.all(axis=1)
+
+    def __contains__(self, url: str) -> bool:
+        return bool(self.contains_many([url])[0])
+
+    def save(self, path: str) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.n_bits, self.n_hashes, self.items, self.built_at))
+            f.write(self.bits.tobytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["BloomFilter"]:
+        try:
+            with open(path, "rb") as f:
+                magic, n_bits, n_hashes, items, built_at = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC:
+                    return None
+                bf = cls(n_bits, n_hashes, built_at)
+                bf.bits = np.frombuffer(f.read(), dtype=np.uint8).copy()
+                bf.items = items
+        except (FileNotFoundError, struct.error):
+            return None
+        if bf.bits.size != (n_bits + 7) // 8:
+            return None
+        return bf
@@ -0,0 +1,166 @@
+# services/browser_pool.py
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+
+logger = logging.getLogger(__name__)
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "3"))
+# A browser is closed and relaunched after this many page loads
+BROWSER_POOL_MAX_USES = int(os.getenv("BROWSER_POOL_MAX_USES", "50"))
+BROWSER_HEADLESS = os.getenv("BROWSER_HEADLESS", "1") not in ("0", "false", "False")
+BROWSER_PAGE_TIMEOUT_S = float(os.getenv("BROWSER_PAGE_TIMEOUT_S", "30"))
+COOKIES_FILE = os.getenv("COOKIES_FILE", "cookies.json")
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0 Safari/537.36"
+)
+
+# Clicks the OneTrust banner if it shows; with the cookies loaded it usually doesn't
+CONSENT_SCRIPT = """
+IF (EXISTS `#onetrust-accept-btn-handler`) THEN CLICK `#onetrust-accept-btn-handler`
+"""
+
+
+def load_cookies(path: str = COOKIES_FILE) -> Optional[list]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print("No cookies.json found, running without cookies")
+        return None
+
+
+class _Slot:
+    def __init__(self):
+        self.crawler: Optional[AsyncWebCrawler] = None
+        self.uses = 0
+
+
+class BrowserPool:
+    """
+    N long-lived crawl4ai browsers shared by all page fetches. A fetch checks
+    out one browser for the duration of the navigation, so at most `size`
+    pages load at once. Browsers start lazily, are relaunched after
+    `max_uses` pages or after an error, and are bound to the event loop that
+    started them (a new loop gets a fresh pool).
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        max_uses: int = BROWSER_POOL_MAX_USES,
+        headless: bool = BROWSER_HEADLESS,
+        cookies_file: str = COOKIES_FILE,
+    ):
+        self.size = size
+        self.max_uses = max_uses
+        self.headless = headless
+        self.cookies_file = cookies_file
+        self._cookies: Optional[list] = None
+        self._cookies_loaded = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Queue] = None
+        self._all: List[_Slot] = []
+
+    def _browser_config(self) -> BrowserConfig:
+        if not self._cookies_loaded:
+            self._cookies = load_cookies(self.cookies_file)
+            self._cookies_loaded = True
+        return BrowserConfig(
+            headless=self.headless,
+            user_agent=USER_AGENT,
+            cookies=self._cookies,
+            viewport_width=1920,
+            viewport_height=1080,
+        )
+
+    def _ensure_slots(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Browsers from a finished loop can't be driven (or closed) here
+            self._loop = loop
+            self._slots = asyncio.Queue()
+            self._all = [_Slot() for _ in range(self.size)]
+            for slot in self._all:
+                self._slots.put_nowait(slot)
+        return self._slots
+
+    async def _retire(self, slot: _Slot) -> None:
+        crawler, slot.crawler, slot.uses = slot.crawler, None, 0
+        if crawler is None:
+            return
+        try:
+            await crawler.close()
+        except Exception:
+            logger.warning("Closing pooled browser failed", exc_info=True)
+
+    @asynccontextmanager
+    async def crawler(self) -> AsyncIterator[AsyncWebCrawler]:
+        """Check out a started crawler; waits while all `size` are busy."""
+        slots = self._ensure_slots()
+        slot = await slots.get()
+        try:
+            if slot.crawler is None:
+                crawler = AsyncWebCrawler(config=self._browser_config())
+                await crawler.start()
+                slot.crawler = crawler
+            try:
+                yield slot.crawler
+            except Exception:
+                # The page may have wedged the browser; start clean next time
+                await self._retire(slot)
+                raise
+            slot.uses += 1
+            if slot.uses >= self.max_uses:
+                await self._retire(slot)
+        finally:
+            slots.put_nowait(slot)
+
+    async def fetch(
+        self,
+        url: str,
+        *,
+        wait_for: Optional[str] = None,
+        delay_s: float = 0.0,
+        timeout_s: float = BROWSER_PAGE_TIMEOUT_S,
+    ):
+        """
+        Load `url` and return the crawl4ai result. `wait_for` is a crawl4ai
+        condition ("css:<selector>" or "js:<predicate>") replacing fixed sleeps;
+        `delay_s` is a short settle time before the HTML is captured.
+        """
+        run_cfg = CrawlerRunConfig(
+            c4a_script=CONSENT_SCRIPT,
+            exclude_external_links=True,
+            wait_for=wait_for,
+            delay_before_return_html=delay_s,
+            page_timeout=int(timeout_s * 1000),
+        )
+        async with self.crawler() as crawler:
+            return await crawler.arun(url=url, config=run_cfg)
+
+    async def close(self) -> None:
+        if self._loop is not asyncio.get_running_loop():
+            return
+        for slot in self._all:
+            await self._retire(slot)
+
+
+_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> BrowserPool:
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
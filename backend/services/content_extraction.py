@@ -0,0 +1,200 @@
+# services/content_extraction.py
+"""
+Deterministic article-body extraction from crawl4ai markdown.
+
+The page is split into blocks (blank-line separated). Each block is scored
+with the usual boilerplate heuristics: link density (share of visible text
+inside links), text density (words per block), sentence punctuation, and a
+small list of cookie / navigation / footer phrases. The body is the
+highest-scoring contiguous run of content blocks, preferably starting at
+the heading that matches the article title.
+"""
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+# At or above this confidence parsed_struct_text skips the structuring LLM;
+# above TRIM_LLM the LLM gets the extracted body instead of the whole page
+CONTENT_EXTRACTION_SKIP_LLM = float(os.getenv("CONTENT_EXTRACTION_SKIP_LLM", "0.75"))
+CONTENT_EXTRACTION_TRIM_LLM = float(os.getenv("CONTENT_EXTRACTION_TRIM_LLM", "0.4"))
+
+_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_BARE_URL_RE = re.compile(r"<?https?://\S+>?")
+_HEADING_RE = re.compile(r"^\s{0,3}(#{1,6})\s+(.*)$")
+_LIST_MARK_RE = re.compile(r"^\s*(?:[*+-]|\d+\.)\s+")
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_SENTENCE_END_RE = re.compile(r"[.!?…][\"'”’)]?(\s|$)")
+
+_BOILERPLATE_PHRASES = (
+    "cookie", "privacy policy", "terms of use", "terms of service", "all rights reserved",
+    "subscribe", "sign in", "sign up", "log in", "newsletter", "advertisement",
+    "accept all", "manage preferences", "skip to", "follow us", "share this",
+    "related articles", "recommended", "read more", "trending", "most popular",
+    "download the app", "copyright", "©",
+)
+
+_MIN_BODY_WORDS = 80
+_CONFIDENT_BODY_WORDS = 250
+
+# Consent, paywall, "enable JavaScript" and bot walls. Shared by the page
+# fetcher's completeness check and the domain extractors' validation.
+WALL_MARKERS = re.compile(
+    "|".join([
+        r"onetrust-banner", r"before you continue", r"we value your privacy",
+        r"subscribe to unlock", r"try unlimited access", r"subscribe to continue reading",
+        r"enable javascript", r"please enable js", r"are you a robot",
+        r"access to this page has been denied",
+    ]),
+    re.IGNORECASE,
+)
+
+
+def looks_walled(markdown: str, body_words: int, min_words: int) -> bool:
+    """
+    True when the page shows a wall marker and the body is short. A marker
+    inside a long body is usually a footer link, so only short pages count.
+    """
+    return bool(WALL_MARKERS.search(markdown)) and body_words < 2 * min_words
+
+
+@dataclass
+class Block:
+    text: str
+    words: int
+    link_density: float
+    heading_level: int
+    boilerplate: bool
+    sentences: int
+
+    @property
+    def is_content(self) -> bool:
+        return (
+            not self.boilerplate
+            and self.heading_level == 0
+            and self.link_density < 0.35
+            and (self.words >= 12 or (self.words >= 5 and self.sentences >= 1))
+        )
+
+
+@dataclass
+class Extraction:
+    main_text: str
+    confidence: float
+    words: int
+    title: Optional[str] = None
+
+
+def _visible(text: str) -> str:
+    text = _IMAGE_RE.sub("", text)
+    text = _LINK_RE.sub(r"\1", text)
+    return _BARE_URL_RE.sub("", text)
+
+
+def _block(raw: str) -> Block:
+    heading = _HEADING_RE.match(raw.strip().splitlines()[0]) if raw.strip() else None
+    visible = _visible(raw)
+    n_chars = max(1, len(visible.strip()))
+    link_chars = sum(len(m.group(1)) for m in _LINK_RE.finditer(raw))
+    lowered = visible.lower()
+    words = len(_WORD_RE.findall(visible))
+    # A phrase only marks a block as chrome when the block is short
+    boilerplate = words < 40 and any(p in lowered for p in _BOILERPLATE_PHRASES)
+    return Block(
+        text=raw,
+        words=words,
+        link_density=min(1.0, link_chars / n_chars),
+        heading_level=len(heading.group(1)) if heading else 0,
+        boilerplate=boilerplate,
+        sentences=len(_SENTENCE_END_RE.findall(visible)),
+    )
+
+
+def split_blocks(markdown: str) -> List[Block]:
+    return [_block(b) for b in re.split(r"\n\s*\n", markdown or "") if b.strip()]
+
+
+def clean_block(text: str) -> str:
+    """Block text as plain prose: no images, link targets, list marks or heading marks."""
+    lines = []
+    for line in _visible(text).splitlines():
+        line = _LIST_MARK_RE.sub("", _HEADING_RE.sub(r"\2", line)).strip()
+        if line:
+            lines.append(line)
+    return " ".join(lines)
+
+
+def _title_index(blocks: List[Block], title: Optional[str]) -> Optional[int]:
+    if not title:
+        return None
+    want = set(_WORD_RE.findall(title.lower()))
+    if not want:
+        return None
+    for i, b in enumerate(blocks):
+        if b.heading_level and b.heading_level <= 2:
+            got = set(_WORD_RE.findall(clean_block(b.text).lower()))
+            if len(want & got) / len(want) >= 0.8:
+                return i
+    return None
+
+
+def _best_run(blocks: List[Block], start: int) -> tuple:
+    """(first, last, words) of the contiguous content run with the most words."""
+    best = (start, start - 1, 0)
+    i = start
+    while i < len(blocks):
+        if not blocks[i].is_content:
+            i += 1
+            continue
+        first, words, gap, j = i, 0, 0, i
+        last = i
+        while j < len(blocks) and gap <= 1:
+            b = blocks[j]
+            if b.is_content:
+                words += b.words
+                last, gap = j, 0
+            elif b.heading_level >= 2 and not b.boilerplate:
+                gap = 0  # sub-headings inside the body
+            else:
+                gap += 1
+            j += 1
+        if words > best[2]:
+            best = (first, last, words)
+        i = last + 1
+    return best
+
+
+def extract_main_content(markdown: str, title: Optional[str] = None) -> Extraction:
+    blocks = split_blocks(markdown)
+    if not blocks:
+        return Extraction(main_text="", confidence=0.0, words=0, title=title)
+
+    title_at = _title_index(blocks, title)
+    start = title_at + 1 if title_at is not None else 0
+    first, last, words = _best_run(blocks, start)
+    if words == 0 and start:
+        first, last, words = _best_run(blocks, 0)
+    body = [
+        clean_block(b.text)
+        for b in blocks[first : last + 1]
+        if b.is_content or b.heading_level >= 2
+    ]
+    main_text = "\n\n".join(t for t in body if t)
+
+    total_words = sum(b.words for b in blocks if not b.boilerplate) or 1
+    run = blocks[first : last + 1]
+    content_share = sum(b.is_content for b in run) / max(1, len(run))
+    confidence = 0.0
+    if words >= _MIN_BODY_WORDS:
+        confidence = (
+            0.45 * min(1.0, words / _CONFIDENT_BODY_WORDS)
+            + 0.25 * content_share
+            + 0.15 * min(1.0, words / total_words / 0.5)
+            + 0.15 * (title_at is not None)
+        )
+    return Extraction(
+        main_text=main_text, confidence=round(confidence, 3), words=words, title=title
+    )
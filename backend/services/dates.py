@@ -0,0 +1,146 @@
+# services/dates.py
+"""
+Deterministic publication-date parsing for the date strings the scrapers
+capture: RFC 822 (RSS `published`), ISO 8601 (`<time datetime>`), Reuters
+("October 1, 2025 · 3:04 PM GMT+1"), Yahoo ("Tue, October 1, 2025 at 3:04
+PM EDT", "2h ago"), CNBC ("Sep 20 2024 9:05 AM EDT") and FT ("October 1
+2025"). Results are timezone-aware UTC datetimes; naive values are UTC.
+"""
+from __future__ import annotations
+
+import re
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Union
+
+from backend.utils.helpers import utcnow
+
+# US zones are what the sources print; fixed offsets are good enough here
+# because the abbreviation already says whether DST applies.
+_TZ_ABBREVIATIONS = {
+    "UTC": 0, "GMT": 0, "Z": 0,
+    "BST": 1, "CET": 1, "CEST": 2,
+    "EST": -5, "EDT": -4, "CST": -6, "CDT": -5,
+    "MST": -7, "MDT": -6, "PST": -8, "PDT": -7,
+}
+
+_MONTHS = {
+    m: i + 1
+    for i, names in enumerate([
+        ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+        ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+        ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"),
+        ("dec", "december"),
+    ])
+    for m in names
+}
+
+# [Weekday,] Month D[,] YYYY [· | at] [H:MM AM] [TZ | GMT+N]
+_HUMAN_RE = re.compile(
+    r"^(?:[A-Za-z]{3,9},?\s+)?"
+    r"(?P<month>[A-Za-z]{3,9})\.?\s+(?P<day>\d{1,2}),?\s+(?P<year>\d{4})"
+    r"(?:\s*(?:[·|,]|at)?\s*(?P<hour>\d{1,2}):(?P<minute>\d{2})\s*(?P<ampm>[AaPp]\.?[Mm]\.?)?)?"
+    r"(?:\s*(?P<tz>[A-Z]{1,4})?(?P<offset>[+-]\d{1,2}(?::?\d{2})?)?)?\s*$"
+)
+# D Month YYYY, e.g. "1 October 2025"
+_DAY_FIRST_RE = re.compile(r"^(?P<day>\d{1,2})\s+(?P<month>[A-Za-z]{3,9})\.?,?\s+(?P<year>\d{4})$")
+_RELATIVE_RE = re.compile(
+    r"^(?P<n>\d+|an?|one)\s*(?P<unit>s|sec|second|m|min|minute|h|hr|hour|d|day|w|week)s?\s+ago$",
+    re.IGNORECASE,
+)
+_RELATIVE_UNITS = {
+    "s": "seconds", "sec": "seconds", "second": "seconds",
+    "m": "minutes", "min": "minutes", "minute": "minutes",
+    "h": "hours", "hr": "hours", "hour": "hours",
+    "d": "days", "day": "days", "w": "weeks", "week": "weeks",
+}
+
+
+def as_utc_datetime(value: Union[date, datetime, None]) -> Optional[datetime]:
+    """Aware UTC datetime; dates become midnight UTC, naive datetimes are taken as UTC."""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _offset(tz: Optional[str], offset: Optional[str]) -> Optional[timezone]:
+    if tz and tz.upper() not in _TZ_ABBREVIATIONS:
+        return None
+    hours = _TZ_ABBREVIATIONS.get((tz or "UTC").upper(), 0)
+    minutes = 0
+    if offset:
+        sign = -1 if offset[0] == "-" else 1
+        digits = offset[1:].replace(":", "")
+        if len(digits) > 2:
+            minutes = sign * int(digits[-2:])
+            digits = digits[:-2]
+        hours += sign * int(digits)
+    return timezone(timedelta(hours=hours, minutes=minutes))
+
+
+def _parse_human(text: str) -> Optional[datetime]:
+    m = _HUMAN_RE.match(text) or _DAY_FIRST_RE.match(text)
+    if not m:
+        return None
+    parts = m.groupdict()
+    month = _MONTHS.get(parts["month"].lower())
+    if month is None:
+        return None
+    hour = int(parts.get("hour") or 0)
+    minute = int(parts.get("minute") or 0)
+    ampm = (parts.get("ampm") or "").lower().replace(".", "")
+    if ampm == "pm" and hour < 12:
+        hour += 12
+    elif ampm == "am" and hour == 12:
+        hour = 0
+    tz = _offset(parts.get("tz"), parts.get("offset"))
+    if tz is None:
+        return None
+    try:
+        return datetime(int(parts["year"]), month, int(parts["day"]), hour, minute, tzinfo=tz)
+    except ValueError:
+        return None
+
+
+def _parse_relative(text: str, now: datetime) -> Optional[datetime]:
+    lowered = text.lower()
+    if lowered in ("just now", "now"):
+        return now
+    if lowered == "yesterday":
+        return now - timedelta(days=1)
+    m = _RELATIVE_RE.match(text)
+    if not m:
+        return None
+    n = m.group("n").lower()
+    count = 1 if n in ("a", "an", "one") else int(n)
+    return now - timedelta(**{_RELATIVE_UNITS[m.group("unit").lower()]: count})
+
+
+def parse_published(
+    value: Union[str, date, datetime, None], now: Optional[datetime] = None
+) -> Optional[datetime]:
+    """Publication time as an aware UTC datetime, or None when the value isn't recognised."""
+    if value is None or isinstance(value, (date, datetime)):
+        return as_utc_datetime(value)
+    text = " ".join(str(value).split())
+    if not text:
+        return None
+
+    try:
+        return as_utc_datetime(datetime.fromisoformat(text.replace("Z", "+00:00")))
+    except ValueError:
+        pass
+    # Before RFC 822: the email parser silently drops AM/PM and zone names,
+    # so a human-format string it can't resolve (unknown zone, impossible
+    # day) is rejected rather than handed on
+    if _HUMAN_RE.match(text) or _DAY_FIRST_RE.match(text):
+        return as_utc_datetime(_parse_human(text))
+    try:
+        return as_utc_datetime(parsedate_to_datetime(text))
+    except (TypeError, ValueError, IndexError):
+        pass
+    return _parse_relative(text, now or utcnow())
@@ -1,5 +1,18 @@
+from typing import Iterable, List, Union
+
+import numpy as np
 from simhash import Simhash
 
+# A 64-bit SimHash is split into SIMHASH_BANDS equal bands. By the pigeonhole
+# principle two hashes within Hamming distance < SIMHASH_BANDS agree exactly on
+# at least one band, so an exact band lookup finds every near-duplicate.
+SIMHASH_BAND_BITS = 16
+SIMHASH_BANDS = 64 // SIMHASH_BAND_BITS
+_BAND_MASK = (1 << SIMHASH_BAND_BITS) - 1
+
+# Bits set per byte value; fallback popcount for NumPy < 2.0
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
 
 def simhash64(text: str) -> int:
     return Simhash(text or "").value
@@ -11,3 +24,47 @@ def hamming_distance(a: int, b: int) -> int:
 
 def to_signed_64(val: int) -> int:
     return val - (1 << 64) if val > 0x7FFF_FFFF_FFFF_FFFF else val
+
+
+def simhash_bands(val: int) -> List[int]:
+    """Split a (signed or unsigned) 64-bit hash into unsigned bands, low bits first."""
+    unsigned = val & 0xFFFF_FFFF_FFFF_FFFF
+    return [
+        (unsigned >> (i * SIMHASH_BAND_BITS)) & _BAND_MASK
+        for i in range(SIMHASH_BANDS)
+    ]
+
+
+def to_uint64_array(values: Union[int, Iterable[int], np.ndarray]) -> np.ndarray:
+    """Hashes (signed or unsigned ints, DB numerics) as a 1-D uint64 array."""
+    if isinstance(values, np.ndarray):
+        if values.dtype == np.uint64:
+            return values.ravel()
+        if values.dtype == np.int64:
+            return values.ravel().view(np.uint64)
+    if isinstance(values, (int, np.integer)):
+        values = [values]
+    return np.array(
+        [int(v) & 0xFFFF_FFFF_FFFF_FFFF for v in values], dtype=np.uint64
+    )
+
+
+def _popcount64(x: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x).astype(np.uint8, copy=False)
+    x = np.ascontiguousarray(x)
+    per_byte = _POPCOUNT_TABLE[x.view(np.uint8)].reshape(*x.shape, 8)
+    return per_byte.sum(axis=-1, dtype=np.uint8)
+
+
+def hamming_matrix(
+    queries: Union[int, Iterable[int], np.ndarray],
+    candidates: Union[Iterable[int], np.ndarray],
+) -> np.ndarray:
+    """
+    Pairwise Hamming distances between 64-bit hashes.
+    Returns a uint8 matrix of shape (len(queries), len(candidates)).
+    """
+    q = to_uint64_array(queries)
+    c = to_uint64_array(candidates)
+    return _popcount64(np.bitwise_xor(q[:, None], c[None, :]))
@@ -0,0 +1,192 @@
+# services/domain_extractors.py
+"""
+Rule-based article extraction for the sources we scrape. Each extractor
+knows where a site's article body ends, which lines are chrome and how the
+site prints dates; the body inside that region is then picked with the
+generic heuristics of services.content_extraction. Output is the same dict
+the structuring LLM returns; anything failing validation (short or
+low-confidence body, consent / paywall / bot wall) returns None so the
+caller can fall back to the LLM.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern
+from urllib.parse import urlparse
+
+from backend.services.content_extraction import extract_main_content, looks_walled
+
+_MIN_BODY_WORDS = 80
+# Extraction confidence (services.content_extraction) the body must reach
+DOMAIN_EXTRACTOR_MIN_CONFIDENCE = float(os.getenv("DOMAIN_EXTRACTOR_MIN_CONFIDENCE", "0.5"))
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_H1_RE = re.compile(r"^\s{0,3}#{1,2}\s+(.+?)\s*$", re.MULTILINE)
+
+
+def _rx(*patterns: str) -> Pattern:
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.MULTILINE | re.IGNORECASE)
+
+
+@dataclass
+class DomainExtractor:
+    provider: str
+    hosts: List[str]
+    # First match after the title ends the article region
+    end_markers: Pattern
+    # Lines dropped from the region before body detection
+    drop_lines: Optional[Pattern] = None
+    date_re: Optional[Pattern] = None
+    # Site-specific teaser markers (hard paywall), on top of the shared walls
+    paywall_re: Optional[Pattern] = None
+    min_words: int = _MIN_BODY_WORDS
+    min_confidence: float = DOMAIN_EXTRACTOR_MIN_CONFIDENCE
+
+    def _region(self, md: str, title: Optional[str]) -> str:
+        start = 0
+        if title:
+            want = set(_WORD_RE.findall(title.lower()))
+            for m in _H1_RE.finditer(md):
+                got = set(_WORD_RE.findall(m.group(1).lower()))
+                if want and len(want & got) / len(want) >= 0.8:
+                    start = m.end()
+                    break
+        end = self.end_markers.search(md, start)
+        region = md[start : end.start() if end else len(md)]
+        if self.drop_lines is not None:
+            region = "\n".join(
+                line for line in region.splitlines() if not self.drop_lines.search(line)
+            )
+        return region
+
+    def find_date(self, md: str) -> Optional[str]:
+        if self.date_re is None:
+            return None
+        m = self.date_re.search(md)
+        return " ".join(g for g in m.groups() if g) if m else None
+
+    def extract(self, article: dict) -> Optional[dict]:
+        md = article.get("main_text") or ""
+        url = article.get("link") or article.get("url")
+        title = (article.get("title") or "").strip()
+        if not title:
+            m = _H1_RE.search(md)
+            title = m.group(1).strip() if m else ""
+        if not (md and url and title):
+            return None
+        if self.paywall_re is not None and self.paywall_re.search(md):
+            return None
+        body = extract_main_content(self._region(md, title))
+        if body.words < self.min_words or body.confidence < self.min_confidence:
+            return None
+        if looks_walled(md, body.words, self.min_words):
+            return None
+        return {
+            "url": url,
+            "image_url": article.get("image") or "",
+            "provider": self.provider,
+            "title": title,
+            "date": article.get("date") or self.find_date(md),
+            "main_text": body.main_text,
+        }
+
+
+EXTRACTORS: List[DomainExtractor] = [
+    DomainExtractor(
+        provider="Yahoo Finance",
+        hosts=["finance.yahoo.com", "yahoo.com"],
+        end_markers=_rx(
+            r"^\s*View comments", r"^\s*Terms\s+and\s+Privacy Policy", r"^\s*Privacy Dashboard",
+            r"^\s*#+\s*Recommended Stories", r"^\s*#+\s*More from",
+        ),
+        drop_lines=_rx(r"^\s*Story continues\s*$", r"^\s*Advertisement\s*$", r"^\s*Read more:"),
+        date_re=re.compile(
+            r"((?:Mon|Tue|Wed|Thu|Fri|Sat|Sun)[a-z]*, [A-Z][a-z]+ \d{1,2}, \d{4})"
+            r"(?: at (\d{1,2}:\d{2} [AP]M(?: [A-Z]{2,4})?))?"
+        ),
+    ),
+    DomainExtractor(
+        provider="CNBC",
+        hosts=["cnbc.com"],
+        end_markers=_rx(
+            r"^\s*\**WATCH:", r"^\s*Subscribe to CNBC PRO", r"^\s*#+\s*Related Tags",
+            r"^\s*#+\s*Trending Now", r"^\s*\**Don't miss these",
+        ),
+        drop_lines=_rx(r"^\s*#+\s*Key Points\s*$", r"^\s*VIDEO\d", r"^\s*Sign up now"),
+        date_re=re.compile(
+            r"(?:Published|Updated)\s+(?:[A-Z][a-z]{2}, )?([A-Z][a-z]{2} \d{1,2} \d{4})"
+            r"\s*(\d{1,2}:\d{2} [AP]M [A-Z]{2,4})?"
+        ),
+    ),
+    DomainExtractor(
+        provider="Reuters",
+        hosts=["reuters.com"],
+        end_markers=_rx(
+            r"^\s*Reporting by", r"^\s*Our Standards:", r"^\s*Sign up here\.",
+            r"^\s*#+\s*Read Next", r"^\s*#+\s*Related Coverage",
+        ),
+        drop_lines=_rx(r"^\s*\d+\s*(?:minute|min) read", r"^\s*Item \d+ of \d+"),
+        date_re=re.compile(
+            r"([A-Z][a-z]+ \d{1,2}, \d{4})(?:\s*[·|]\s*(\d{1,2}:\d{2} [AP]M GMT[+-]?\d*))?"
+        ),
+    ),
+    DomainExtractor(
+        provider="Financial Times",
+        hosts=["ft.com"],
+        end_markers=_rx(
+            r"^\s*Copyright The Financial Times", r"^\s*Reuse this content",
+            r"^\s*#+\s*Promoted Content", r"^\s*#+\s*Latest on", r"^\s*#+\s*Comments",
+        ),
+        drop_lines=_rx(r"^\s*Unlock the Editor", r"^\s*Stay informed with free updates"),
+        date_re=re.compile(r"([A-Z][a-z]+ \d{1,2} \d{4})"),
+        paywall_re=_rx(r"Subscribe to unlock this article", r"Try unlimited access"),
+    ),
+]
+
+
+def _host(url: str) -> str:
+    host = urlparse(url or "").netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def extractor_for(url: str) -> Optional[DomainExtractor]:
+    host = _host(url)
+    for ex in EXTRACTORS:
+        if any(host == h or host.endswith("." + h) for h in ex.hosts):
+            return ex
+    return None
+
+
+def provider_for(url: str) -> str:
+    ex = extractor_for(url)
+    return ex.provider if ex else _host(url)
+
+
+class ExtractionStats:
+    """Per-domain outcome counts: rule / generic extractor hit or LLM fallback."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, url: str, outcome: str) -> None:
+        with self._lock:
+            self._counts[_host(url) or "unknown"][outcome] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            out = {}
+            for domain, c in self._counts.items():
+                total = sum(c.values())
+                out[domain] = {
+                    **c,
+                    "total": total,
+                    "hit_rate": round((c["rule"] + c["generic"]) / total, 3) if total else 0.0,
+                }
+            return out
+
+
+extraction_stats = ExtractionStats()
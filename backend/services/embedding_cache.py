@@ -0,0 +1,152 @@
+# services/embedding_cache.py
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Optional
+
+import numpy as np
+
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", ".cache/embeddings.sqlite3")
+EMBED_CACHE_MEMORY_ITEMS = int(os.getenv("EMBED_CACHE_MEMORY_ITEMS", "5000"))
+EMBED_CACHE_DISK_ITEMS = int(os.getenv("EMBED_CACHE_DISK_ITEMS", "200000"))
+EMBED_CACHE_DISABLED = os.getenv("EMBED_CACHE_DISABLED", "0") == "1"
+
+# Share of disk entries dropped at once when the bound is hit, so eviction
+# does not run on every insert
+_EVICT_FRACTION = 0.1
+
+
+def normalize_text(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def cache_key(model: str, text: str) -> str:
+    """Content address of an embedding: hash of (model name, normalized text)."""
+    payload = f"{model}\x00{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache: an in-process LRU in front of a SQLite store.
+    Vectors are kept as float32 (raw bytes on disk); both tiers are size-bounded
+    and evict least recently used entries. The memory tier has its own lock,
+    so get_memory() never waits behind disk I/O and is safe on the event loop.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = EMBED_CACHE_PATH,
+        memory_items: int = EMBED_CACHE_MEMORY_ITEMS,
+        disk_items: int = EMBED_CACHE_DISK_ITEMS,
+    ):
+        self.memory_items = memory_items
+        self.disk_items = disk_items
+        self.stats: Counter = Counter()
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._disk_count = 0
+        if path:
+            self._open(path)
+
+    def _open(self, path: str) -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vec BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS ix_embeddings_last_used ON embeddings (last_used)"
+        )
+        self._disk_count = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_memory(self, key: str) -> Optional[np.ndarray]:
+        """Memory tier only: no disk access."""
+        with self._memory_lock:
+            vec = self._memory.get(key)
+            if vec is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+            return vec
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        vec = self.get_memory(key)
+        if vec is not None:
+            return vec
+        if self._db is not None:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT vec FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                        (time.time(), key),
+                    )
+            if row is not None:
+                vec = np.frombuffer(row[0], dtype=np.float32)
+                self._remember(key, vec)
+                self.stats["disk_hits"] += 1
+                return vec
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, vec) -> np.ndarray:
+        arr = np.asarray(vec, dtype=np.float32)
+        self._remember(key, arr)
+        if self._db is not None:
+            with self._lock:
+                exists = self._db.execute(
+                    "SELECT 1 FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, vec, last_used) VALUES (?, ?, ?)",
+                    (key, arr.tobytes(), time.time()),
+                )
+                # Replacing an existing key doesn't grow the store
+                if exists is None:
+                    self._disk_count += 1
+                if self._disk_count > self.disk_items:
+                    self._evict_disk()
+        return arr
+
+    def _remember(self, key: str, vec: np.ndarray) -> None:
+        with self._memory_lock:
+            self._memory[key] = vec
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+                self.stats["memory_evictions"] += 1
+
+    def _evict_disk(self) -> None:
+        n = max(1, int(self.disk_items * _EVICT_FRACTION))
+        self._db.execute(
+            "DELETE FROM embeddings WHERE key IN "
+            "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+            (n,),
+        )
+        self._disk_count = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        self.stats["disk_evictions"] += n
+
+    def clear(self) -> None:
+        with self._memory_lock:
+            self._memory.clear()
+        with self._lock:
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._disk_count = 0
@@ -1,8 +1,206 @@
-from typing import List
+import asyncio
+import logging
+import os
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import tiktoken
 from langchain_openai import OpenAIEmbeddings
 
-_embedding = OpenAIEmbeddings(model="text-embedding-3-small")
+from backend.services.embedding_cache import (
+    EMBED_CACHE_DISABLED,
+    EmbeddingCache,
+    cache_key,
+)
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+_embedding = OpenAIEmbeddings(model=EMBEDDING_MODEL)
+_cache: Optional[EmbeddingCache] = None
+
+# Batching: concurrent aembed_text() callers are coalesced into one
+# embed_documents request, flushed after a short window, at MAX_ITEMS texts or
+# before the request would exceed MAX_TOKENS (the API caps tokens per request).
+EMBED_BATCH_WINDOW_MS = int(os.getenv("EMBED_BATCH_WINDOW_MS", "50"))
+EMBED_BATCH_MAX_ITEMS = int(os.getenv("EMBED_BATCH_MAX_ITEMS", "128"))
+EMBED_BATCH_MAX_TOKENS = int(os.getenv("EMBED_BATCH_MAX_TOKENS", "250000"))
+_encoding = None
+
+# Re-embed guard: within one ingest run (embed_scope) a text should reach the
+# embeddings API at most once -- normalize_article embeds it and the vector is
+# carried downstream. Only API calls count; cache hits are free. Repeats are
+# reported per stage; EMBED_REEMBED_STRICT=1 turns them into an error.
+REEMBED_STRICT = os.getenv("EMBED_REEMBED_STRICT", "0") == "1"
+_embed_scope: ContextVar[Optional[Dict[str, str]]] = ContextVar("embed_scope", default=None)
+reembed_counts: Counter = Counter()
+
+
+@contextmanager
+def embed_scope() -> Iterator[None]:
+    """Track API embeddings for one run; tasks started inside share the scope."""
+    token = _embed_scope.set({})
+    try:
+        yield
+    finally:
+        _embed_scope.reset(token)
+
+
+def _check_reembed(key: str, stage: str) -> None:
+    seen = _embed_scope.get()
+    if seen is None:
+        return
+    prev = seen.get(key)
+    if prev is None:
+        seen[key] = stage
+        return
+    reembed_counts[stage] += 1
+    msg = f"Stage '{stage}' re-embedded text already embedded by '{prev}' in this run"
+    if REEMBED_STRICT:
+        raise RuntimeError(msg)
+    logger.warning(msg)
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _cache
+    if _cache is None:
+        _cache = EmbeddingCache()
+    return _cache
+
+
+def embed_text(text: str, stage: str = "unspecified", use_cache: bool = True) -> List[float]:
+    key = cache_key(EMBEDDING_MODEL, text)
+    if not use_cache or EMBED_CACHE_DISABLED:
+        _check_reembed(key, stage)
+        return _embedding.embed_query(text)
+
+    cache = get_embedding_cache()
+    vec = cache.get(key)
+    if vec is None:
+        _check_reembed(key, stage)
+        vec = cache.put(key, _embedding.embed_query(text))
+    return vec.tolist()
+
+
+def count_embedding_tokens(text: str) -> int:
+    global _encoding
+    if _encoding is None:
+        _encoding = tiktoken.encoding_for_model(EMBEDDING_MODEL)
+    return len(_encoding.encode(text, disallowed_special=()))
+
+
+class EmbeddingBatcher:
+    """Collects texts from concurrent callers and embeds them in one request."""
+
+    def __init__(
+        self,
+        window_ms: int = EMBED_BATCH_WINDOW_MS,
+        max_items: int = EMBED_BATCH_MAX_ITEMS,
+        max_tokens: int = EMBED_BATCH_MAX_TOKENS,
+    ):
+        self.window_s = window_ms / 1000.0
+        self.max_items = max_items
+        self.max_tokens = max_tokens
+        self.loop = asyncio.get_running_loop()
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._pending_tokens = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: set = set()
+        # Cache misses being embedded right now, by cache key
+        self.by_key: Dict[str, asyncio.Future] = {}
+        self.requests = 0
+        self.texts = 0
+
+    async def embed(self, text: str) -> List[float]:
+        n_tokens = count_embedding_tokens(text)
+        if self._pending and self._pending_tokens + n_tokens > self.max_tokens:
+            self._flush()
+        fut = self.loop.create_future()
+        self._pending.append((text, fut))
+        self._pending_tokens += n_tokens
+        if len(self._pending) >= self.max_items or self._pending_tokens >= self.max_tokens:
+            self._flush()
+        elif self._timer is None:
+            self._timer = self.loop.call_later(self.window_s, self._flush)
+        return await fut
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_tokens = self._pending, [], 0
+        task = self.loop.create_task(self._send(batch))
+        # Keep a reference so the task is not garbage-collected mid-flight
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        self.requests += 1
+        self.texts += len(batch)
+        try:
+            vectors = await _embedding.aembed_documents([t for t, _ in batch])
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut), vec in zip(batch, vectors):
+            if not fut.done():
+                fut.set_result(vec)
+
+
+_batcher: Optional[EmbeddingBatcher] = None
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    global _batcher
+    if _batcher is None or _batcher.loop is not asyncio.get_running_loop():
+        _batcher = EmbeddingBatcher()
+    return _batcher
+
+
+async def _embed_and_store(key: str, text: str):
+    vec = await get_embedding_batcher().embed(text)
+    # SQLite write (and fsync) off the event loop
+    return await asyncio.to_thread(get_embedding_cache().put, key, vec)
+
+
+async def aembed_text(text: str, stage: str = "unspecified", use_cache: bool = True) -> List[float]:
+    """Async embed_text(); concurrent calls share one batched API request."""
+    key = cache_key(EMBEDDING_MODEL, text)
+    if not use_cache or EMBED_CACHE_DISABLED:
+        _check_reembed(key, stage)
+        return await get_embedding_batcher().embed(text)
+
+    # Memory tier on the loop; the SQLite tier in a worker thread
+    cache = get_embedding_cache()
+    vec = cache.get_memory(key)
+    if vec is None:
+        vec = await asyncio.to_thread(cache.get, key)
+    if vec is not None:
+        return vec.tolist()
+    # Concurrent misses on the same text wait for one API call
+    batcher = get_embedding_batcher()
+    fut = batcher.by_key.get(key)
+    if fut is None:
+        _check_reembed(key, stage)
+        fut = asyncio.ensure_future(_embed_and_store(key, text))
+        batcher.by_key[key] = fut
+        fut.add_done_callback(lambda _f: batcher.by_key.pop(key, None))
+    # shield: one cancelled caller must not cancel the others' request
+    return (await asyncio.shield(fut)).tolist()
 
 
-def embed_text(text: str) -> List[float]:
-    return _embedding.embed_query(text)
+async def aembed_texts(
+    texts: List[str], stage: str = "unspecified", use_cache: bool = True
+) -> List[List[float]]:
+    """Embed many texts at once; results are in input order."""
+    return list(
+        await asyncio.gather(
+            *(aembed_text(t, stage=stage, use_cache=use_cache) for t in texts)
+        )
+    )
@@ -0,0 +1,67 @@
+# services/feed_poller.py
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import feedparser
+
+from backend.services.browser_pool import USER_AGENT
+
+
+@dataclass
+class FeedPoll:
+    status: Optional[int]
+    not_modified: bool = False
+    # Entries of the feed, in feed order; empty when not modified
+    entries: List = field(default_factory=list)
+
+
+class FeedPoller:
+    """
+    Conditional RSS polling. Keeps each feed's ETag / Last-Modified in memory
+    and returns nothing when the feed is unchanged (304). Which returned
+    entries are already stored is left to the URL filter and the ingest
+    precheck, so nothing is marked as handled before it was ingested.
+    """
+
+    def __init__(self):
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        # url -> (etag, modified)
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+    def poll(self, url: str, limit: Optional[int] = None, start: int = 0) -> FeedPoll:
+        """Fetch `url` conditionally; at most `limit` entries from position `start`."""
+        with self._lock:
+            etag, modified = self._validators.get(url, (None, None))
+        feed = feedparser.parse(url, etag=etag, modified=modified, agent=USER_AGENT)
+        status = feed.get("status")
+        if status == 304:
+            self.stats["not_modified"] += 1
+            return FeedPoll(status=status, not_modified=True)
+        if status is None or status >= 400:
+            # Network or HTTP error: keep the stored state untouched
+            self.stats["errors"] += 1
+            return FeedPoll(status=status)
+
+        entries = feed.entries[start:]
+        if limit is not None:
+            entries = entries[:limit]
+        if feed.get("etag") or feed.get("modified"):
+            with self._lock:
+                self._validators[url] = (feed.get("etag"), feed.get("modified"))
+        self.stats["fetched"] += 1
+        return FeedPoll(status=status, entries=entries)
+
+
+_poller: Optional[FeedPoller] = None
+
+
+def get_feed_poller() -> FeedPoller:
+    global _poller
+    if _poller is None:
+        _poller = FeedPoller()
+    return _poller
@@ -0,0 +1,294 @@
+# services/llm_cache.py
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional, Type
+
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+from langchain_core.messages import BaseMessage, messages_from_dict, messages_to_dict
+from pydantic import BaseModel
+
+from backend.services.token_budget import DEFAULT_MODEL, count_tokens, usage
+
+# off         - call the model every time
+# read_write  - serve identical calls from the cache, store new responses
+# replay      - serve only cached responses; a miss raises LLMCacheMiss
+#               (offline re-runs for benchmarks and regression tests)
+LLM_CACHE_MODE = os.getenv("LLM_CACHE_MODE", "read_write").lower()
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm.sqlite3")
+LLM_CACHE_TTL_S = float(os.getenv("LLM_CACHE_TTL_S", str(7 * 86400)))
+LLM_CACHE_MAX_ITEMS = int(os.getenv("LLM_CACHE_MAX_ITEMS", "50000"))
+
+_MODES = ("off", "read_write", "replay")
+# Share of entries dropped at once when the bound is hit
+_EVICT_FRACTION = 0.1
+
+
+class LLMCacheMiss(KeyError):
+    pass
+
+
+def _llm_params(llm) -> Dict[str, Any]:
+    return {
+        "model": getattr(llm, "model_name", None) or getattr(llm, "model", None),
+        "temperature": getattr(llm, "temperature", None),
+    }
+
+
+# Keyword arguments bound into a runnable that change what the model returns
+_BOUND_KWARGS = ("tools", "functions", "tool_choice", "response_format")
+
+
+def _bound_tools(runnable) -> list:
+    """
+    Tool / function definitions bound into `runnable` by bind_tools() or
+    with_structured_output(), found by walking its bindings and steps.
+    """
+    found = []
+    stack = [runnable]
+    while stack:
+        r = stack.pop()
+        kwargs = getattr(r, "kwargs", None)
+        if isinstance(kwargs, dict):
+            found.extend({k: kwargs[k]} for k in _BOUND_KWARGS if k in kwargs)
+        if getattr(r, "bound", None) is not None:
+            stack.append(r.bound)
+        stack.extend(getattr(r, "steps", None) or [])
+    return found
+
+
+def _schema_hash(schema: Optional[Type[BaseModel]]) -> Optional[str]:
+    if schema is None:
+        return None
+    blob = json.dumps(schema.model_json_schema(), sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def cache_key(llm, template_id: str, prompt_value, *, schema=None, tools=None) -> str:
+    """
+    Content address of an LLM call: (model, temperature, template id, rendered
+    prompt, output schema, bound tools). Keying on the rendered messages covers
+    both the template text and the inputs, so editing a prompt invalidates its
+    entries; the JSON schema and tool definitions do the same for a changed
+    output model.
+    """
+    payload = {
+        **_llm_params(llm),
+        "template": template_id,
+        "messages": [[m.type, m.content] for m in prompt_value.to_messages()],
+        "schema": _schema_hash(schema),
+        "tools": tools or [],
+    }
+    blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _encode(value: Any) -> str:
+    if isinstance(value, BaseMessage):
+        return json.dumps({"kind": "message", "data": messages_to_dict([value])[0]})
+    if isinstance(value, BaseModel):
+        return json.dumps({"kind": "model", "data": value.model_dump(mode="json")})
+    return json.dumps({"kind": "json", "data": value}, default=str)
+
+
+def _decode(payload: str, schema: Optional[Type[BaseModel]]) -> Any:
+    obj = json.loads(payload)
+    if obj["kind"] == "message":
+        return messages_from_dict([obj["data"]])[0]
+    if obj["kind"] == "model" and schema is not None:
+        return schema.model_validate(obj["data"])
+    return obj["data"]
+
+
+class LLMCache:
+    """
+    SQLite store of LLM responses keyed by cache_key(). Entries expire after
+    ttl_s and the store is bounded to max_items, evicting least recently used.
+    """
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        ttl_s: float = LLM_CACHE_TTL_S,
+        max_items: int = LLM_CACHE_MAX_ITEMS,
+    ):
+        self.ttl_s = ttl_s
+        self.max_items = max_items
+        self.stats: Counter = Counter()
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                template_id TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS ix_responses_last_used ON responses (last_used)"
+        )
+        self._count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str, template_id: str, ignore_ttl: bool = False) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT payload, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            now = time.time()
+            if row is None or (not ignore_ttl and now - row[1] > self.ttl_s):
+                self.stats[f"{template_id}:misses"] += 1
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.stats[f"{template_id}:hits"] += 1
+            return row[0]
+
+    def put(self, key: str, template_id: str, payload: str) -> None:
+        now = time.time()
+        with self._lock:
+            exists = self._db.execute(
+                "SELECT 1 FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, template_id, payload, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, template_id, payload, now, now),
+            )
+            # Replacing an existing key (refresh=True) doesn't grow the store
+            if exists is None:
+                self._count += 1
+            if self._count > self.max_items:
+                self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        self._db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_s,))
+        n = max(1, int(self.max_items * _EVICT_FRACTION))
+        self._db.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+            (n,),
+        )
+        self._count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._count = 0
+
+
+_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    global _cache
+    if _cache is None:
+        _cache = LLMCache()
+    return _cache
+
+
+def _mode() -> str:
+    if LLM_CACHE_MODE not in _MODES:
+        raise ValueError(f"LLM_CACHE_MODE must be one of {_MODES}, got {LLM_CACHE_MODE!r}")
+    return LLM_CACHE_MODE
+
+
+def _prompt_tokens(llm, prompt_value) -> int:
+    text = "\n".join(str(m.content) for m in prompt_value.to_messages())
+    return count_tokens(text, _llm_params(llm)["model"] or DEFAULT_MODEL)
+
+
+def _lookup(llm, runnable, template_id, prompt_value, schema, refresh):
+    """Returns (key, cached value or None); raises LLMCacheMiss in replay mode."""
+    mode = _mode()
+    if mode == "off":
+        return None, None
+    key = cache_key(
+        llm, template_id, prompt_value, schema=schema, tools=_bound_tools(runnable)
+    )
+    if refresh and mode != "replay":
+        return key, None
+    payload = get_llm_cache().get(key, template_id, ignore_ttl=mode == "replay")
+    if payload is not None:
+        return key, _decode(payload, schema)
+    if mode == "replay":
+        raise LLMCacheMiss(f"No cached response for '{template_id}' (replay mode)")
+    return key, None
+
+
+def _record_api_usage(template_id: str, handler: UsageMetadataCallbackHandler) -> None:
+    for model_name, u in handler.usage_metadata.items():
+        usage.record_api_usage(
+            template_id, u.get("input_tokens", 0), u.get("output_tokens", 0), model_name
+        )
+
+
+async def ainvoke_cached(
+    prompt,
+    runnable,
+    inputs: Dict[str, Any],
+    *,
+    template_id: str,
+    llm,
+    schema: Optional[Type[BaseModel]] = None,
+    refresh: bool = False,
+) -> Any:
+    """
+    Cached equivalent of `(prompt | runnable).ainvoke(inputs)`. `llm` is the
+    chat model inside `runnable` (model name and temperature are part of the
+    key); `schema` rebuilds structured outputs. refresh=True skips the read
+    (e.g. when retrying after an unparseable answer) but stores the new one.
+    Prompt size and API token usage are recorded per template id. SQLite
+    reads and writes run in a worker thread.
+    """
+    prompt_value = prompt.invoke(inputs)
+    n_prompt = _prompt_tokens(llm, prompt_value)
+    key, value = await asyncio.to_thread(
+        _lookup, llm, runnable, template_id, prompt_value, schema, refresh
+    )
+    usage.record_prompt(template_id, n_prompt, cached=value is not None)
+    if value is not None:
+        return value
+    handler = UsageMetadataCallbackHandler()
+    value = await runnable.ainvoke(prompt_value, config={"callbacks": [handler]})
+    _record_api_usage(template_id, handler)
+    if key is not None:
+        await asyncio.to_thread(get_llm_cache().put, key, template_id, _encode(value))
+    return value
+
+
+def invoke_cached(
+    prompt,
+    runnable,
+    inputs: Dict[str, Any],
+    *,
+    template_id: str,
+    llm,
+    schema: Optional[Type[BaseModel]] = None,
+    refresh: bool = False,
+) -> Any:
+    """Sync variant of ainvoke_cached() for nodes that run in a worker thread."""
+    prompt_value = prompt.invoke(inputs)
+    n_prompt = _prompt_tokens(llm, prompt_value)
+    key, value = _lookup(llm, runnable, template_id, prompt_value, schema, refresh)
+    usage.record_prompt(template_id, n_prompt, cached=value is not None)
+    if value is not None:
+        return value
+    handler = UsageMetadataCallbackHandler()
+    value = runnable.invoke(prompt_value, config={"callbacks": [handler]})
+    _record_api_usage(template_id, handler)
+    if key is not None:
+        get_llm_cache().put(key, template_id, _encode(value))
+    return value
@@ -0,0 +1,280 @@
+# services/page_fetch.py
+"""
+Article page fetching. A page is tried over plain HTTP first (pooled
+httpx client: keep-alive, HTTP/2, gzip/br/zstd, conditional requests) and
+converted with crawl4ai's markdown generator, so both tiers yield the same
+markdown. Only when that result fails the completeness check (too little
+body text, consent wall, paywall or "enable JavaScript" page) is the page
+loaded in the pooled browser.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+from backend.services.browser_pool import USER_AGENT, get_browser_pool, load_cookies
+from backend.services.content_extraction import extract_main_content, looks_walled
+
+logger = logging.getLogger(__name__)
+
+# Pages loading at once across all sources, and per site
+PAGE_FETCH_CONCURRENCY = int(os.getenv("PAGE_FETCH_CONCURRENCY", "6"))
+PAGE_FETCH_PER_DOMAIN = int(os.getenv("PAGE_FETCH_PER_DOMAIN", "2"))
+# Whole fetch, including the wait for a free browser
+PAGE_FETCH_TIMEOUT_S = float(os.getenv("PAGE_FETCH_TIMEOUT_S", "60"))
+PAGE_FETCH_HTTP_TIMEOUT_S = float(os.getenv("PAGE_FETCH_HTTP_TIMEOUT_S", "10"))
+# Body words the HTTP tier must find for the page to count as complete
+PAGE_FETCH_MIN_WORDS = int(os.getenv("PAGE_FETCH_MIN_WORDS", "150"))
+# After this many HTTP attempts on a domain, a success rate below
+# PAGE_FETCH_HTTP_MIN_RATE sends its pages straight to the browser
+_HTTP_PROBE_ATTEMPTS = 20
+PAGE_FETCH_HTTP_MIN_RATE = float(os.getenv("PAGE_FETCH_HTTP_MIN_RATE", "0.1"))
+# ETag / Last-Modified and markdown of recently fetched pages
+_VALIDATOR_CACHE_ITEMS = 1000
+
+_CONSENT_HOSTS = ("consent.", "guce.")
+_META_RE = re.compile(r"<meta\b[^>]*>", re.IGNORECASE)
+_OG_IMAGE_RE = re.compile(r"""property\s*=\s*["']og:image["']""", re.IGNORECASE)
+_CONTENT_RE = re.compile(r"""content\s*=\s*["']([^"']+)["']""", re.IGNORECASE)
+
+
+def _domain(url: str) -> str:
+    host = urlparse(url or "").netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class FetchLimiter:
+    """Global and per-domain semaphores, bound to the running event loop."""
+
+    def __init__(
+        self,
+        concurrency: int = PAGE_FETCH_CONCURRENCY,
+        per_domain: int = PAGE_FETCH_PER_DOMAIN,
+    ):
+        self.concurrency = concurrency
+        self.per_domain = per_domain
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._global: Optional[asyncio.Semaphore] = None
+        self._domains: Dict[str, asyncio.Semaphore] = {}
+
+    def _ensure(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._global = asyncio.Semaphore(self.concurrency)
+            self._domains = defaultdict(lambda: asyncio.Semaphore(self.per_domain))
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        self._ensure()
+        # Domain first, so one slow site can't hold global slots while queued
+        async with self._domains[_domain(url)]:
+            async with self._global:
+                yield
+
+
+limiter = FetchLimiter()
+
+
+class TierStats:
+    """Per-domain counts of which tier served each page."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, url: str, outcome: str) -> None:
+        with self._lock:
+            self._counts[_domain(url) or "unknown"][outcome] += 1
+
+    def http_pointless(self, url: str) -> bool:
+        """True once the HTTP tier has (almost) never been enough for this domain."""
+        with self._lock:
+            c = self._counts.get(_domain(url))
+            if not c:
+                return False
+            served = c["http"] + c["http_not_modified"]
+            attempts = served + c["http_incomplete"] + c["http_error"]
+            return attempts >= _HTTP_PROBE_ATTEMPTS and served / attempts < PAGE_FETCH_HTTP_MIN_RATE
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {domain: dict(c) for domain, c in self._counts.items()}
+
+
+tier_stats = TierStats()
+
+
+class _HttpTier:
+    """Loop-bound pooled httpx client plus a small LRU of page validators."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._validators: "OrderedDict[str, Tuple[Optional[str], Optional[str], str]]" = OrderedDict()
+        self._markdown = DefaultMarkdownGenerator()
+
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._client is None:
+            self._loop = loop
+            self._client = httpx.AsyncClient(
+                http2=True,
+                follow_redirects=True,
+                timeout=PAGE_FETCH_HTTP_TIMEOUT_S,
+                limits=httpx.Limits(
+                    max_connections=PAGE_FETCH_CONCURRENCY * 2,
+                    max_keepalive_connections=PAGE_FETCH_CONCURRENCY,
+                ),
+                headers={
+                    "User-Agent": USER_AGENT,
+                    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+                    "Accept-Language": "en-US,en;q=0.9",
+                    # br / zstd are decoded by httpx when Brotli / zstandard are installed
+                    "Accept-Encoding": "gzip, deflate, br, zstd",
+                },
+            )
+            # Same consent cookies the browsers use
+            for c in load_cookies() or []:
+                if c.get("name") and c.get("value") is not None:
+                    self._client.cookies.set(
+                        c["name"], c["value"], domain=c.get("domain", ""), path=c.get("path", "/")
+                    )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+
+    def _remember(self, url: str, resp: httpx.Response, markdown: str) -> None:
+        etag, modified = resp.headers.get("etag"), resp.headers.get("last-modified")
+        if not (etag or modified):
+            return
+        self._validators[url] = (etag, modified, markdown)
+        self._validators.move_to_end(url)
+        while len(self._validators) > _VALIDATOR_CACHE_ITEMS:
+            self._validators.popitem(last=False)
+
+    def to_markdown(self, html: str, url: str) -> str:
+        result = self._markdown.generate_markdown(input_html=html, base_url=url, citations=False)
+        return result.raw_markdown
+
+    async def fetch(self, url: str, title: Optional[str] = None) -> Optional[str]:
+        """Markdown when the HTTP response is a complete article page, else None."""
+        headers = {}
+        cached = self._validators.get(url)
+        if cached:
+            etag, modified, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if modified:
+                headers["If-Modified-Since"] = modified
+        try:
+            resp = await self.client().get(url, headers=headers)
+        except httpx.HTTPError as e:
+            logger.debug("HTTP tier failed for %s: %s", url, e)
+            tier_stats.record(url, "http_error")
+            return None
+
+        if resp.status_code == 304 and cached:
+            tier_stats.record(url, "http_not_modified")
+            return cached[2]
+        if (
+            resp.status_code != 200
+            or "html" not in resp.headers.get("content-type", "")
+            or resp.url.host.startswith(_CONSENT_HOSTS)
+        ):
+            tier_stats.record(url, "http_incomplete")
+            return None
+
+        markdown = await asyncio.to_thread(self.to_markdown, resp.text, str(resp.url))
+        if not is_complete(markdown, title):
+            tier_stats.record(url, "http_incomplete")
+            return None
+        self._remember(url, resp, markdown)
+        tier_stats.record(url, "http")
+        return markdown
+
+
+_http = _HttpTier()
+
+
+def is_complete(markdown: str, title: Optional[str] = None) -> bool:
+    """Enough article body and no consent / paywall / JavaScript wall."""
+    if not markdown:
+        return False
+    extraction = extract_main_content(markdown, title)
+    if extraction.words < PAGE_FETCH_MIN_WORDS:
+        return False
+    return not looks_walled(markdown, extraction.words, PAGE_FETCH_MIN_WORDS)
+
+
+async def _fetch_browser(url: str) -> Optional[str]:
+    result = await get_browser_pool().fetch(url, wait_for="css:p", delay_s=1.0)
+    if not getattr(result, "success", True):
+        logger.warning("Page fetch failed: %s (%s)", url, getattr(result, "error_message", ""))
+        tier_stats.record(url, "failed")
+        return None
+    tier_stats.record(url, "browser")
+    return result.markdown
+
+
+async def fetch_page(
+    url: str, title: Optional[str] = None, timeout_s: float = PAGE_FETCH_TIMEOUT_S
+) -> Optional[str]:
+    """
+    Page markdown, or None when the fetch failed or timed out; one bad page
+    never fails the batch it belongs to. `title` helps the completeness check
+    find the article body.
+    """
+    try:
+        async with asyncio.timeout(timeout_s):
+            async with limiter.slot(url):
+                if not tier_stats.http_pointless(url):
+                    markdown = await _http.fetch(url, title)
+                    if markdown is not None:
+                        return markdown
+                return await _fetch_browser(url)
+    except TimeoutError:
+        logger.warning("Page fetch timed out after %.0fs: %s", timeout_s, url)
+    except Exception:
+        logger.warning("Page fetch failed: %s", url, exc_info=True)
+    tier_stats.record(url, "failed")
+    return None
+
+
+def _og_image(html: str) -> Optional[str]:
+    for tag in _META_RE.findall(html):
+        if _OG_IMAGE_RE.search(tag):
+            m = _CONTENT_RE.search(tag)
+            if m:
+                return m.group(1)
+    return None
+
+
+async def fetch_og_image(url: str, timeout_s: float = PAGE_FETCH_HTTP_TIMEOUT_S) -> Optional[str]:
+    """og:image of a page over the pooled HTTP client; None when unavailable."""
+    try:
+        async with asyncio.timeout(timeout_s):
+            async with limiter.slot(url):
+                resp = await _http.client().get(url)
+        resp.raise_for_status()
+    except (httpx.HTTPError, TimeoutError) as e:
+        logger.debug("og:image fetch failed for %s: %s", url, e)
+        return None
+    return _og_image(resp.text)
+
+
+async def aclose_http_client() -> None:
+    await _http.aclose()
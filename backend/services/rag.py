@@ -1,12 +1,12 @@
 # services/rag.py
 from __future__ import annotations
-from typing import List
+from typing import List, Optional
 from sqlalchemy import select, bindparam, cast
 from sqlalchemy.orm import Session
 
 from backend.db.models import Article
 from backend.db.types import Vector1536
-from backend.services.embeddings import embed_text
+from backend.services.embeddings import aembed_text
 
 DEFAULT_STYLE = (
     "Tone: neutral, concise, evidence-led. Avoid hype. Prefer numbers over adjectives. "
@@ -18,13 +18,17 @@ DEFAULT_STYLE = (
 def get_style_guide() -> str:
     return DEFAULT_STYLE
 
-async def get_brand_snippets(session: Session, query_text: str, k: int = 3) -> str:
+async def get_brand_snippets(
+    session: Session, query_text: str, k: int = 3, emb: Optional[List[float]] = None
+) -> str:
     """
     Optional: pull phrasing snippets from a 'brand_knowledge' table with (content TEXT, content_emb vector(1536)).
     If table not present, return empty string.
+    Pass `emb` to reuse an existing article embedding instead of embedding query_text.
     """
     try:
-        emb = embed_text(query_text)
+        if emb is None:
+            emb = await aembed_text(query_text, stage="get_brand_snippets")
         # dynamic text SQL since no model; safe with bindparam and cast
         rows = await session.execute(
             select(
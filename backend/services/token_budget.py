@@ -0,0 +1,144 @@
+# services/token_budget.py
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+import tiktoken
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "gpt-4o"
+
+# Input token budget per stage (the variable part of the prompt, not the
+# template). Overridable as TOKEN_BUDGET_<STAGE>, dots as underscores, e.g.
+# TOKEN_BUDGET_NEWS_ANALYSIS_EXTRACT=8000.
+_DEFAULT_BUDGETS = {
+    "normalize_article": 6000,
+    "parsed_struct_text": 12000,
+    "news_analysis.extract": 6000,
+    "news_analysis.write": 4000,
+    "verify_packet": 6000,
+    "entity_extraction": 4000,
+}
+STAGE_BUDGETS: Dict[str, int] = {
+    stage: int(os.getenv("TOKEN_BUDGET_" + stage.replace(".", "_").upper(), default))
+    for stage, default in _DEFAULT_BUDGETS.items()
+}
+
+_TRUNCATION_MARK = "\n[... truncated ...]\n"
+_encodings: Dict[str, tiktoken.Encoding] = {}
+
+
+def _encoding(model: str) -> tiktoken.Encoding:
+    enc = _encodings.get(model)
+    if enc is None:
+        try:
+            enc = tiktoken.encoding_for_model(model)
+        except KeyError:
+            enc = tiktoken.get_encoding("o200k_base")
+        _encodings[model] = enc
+    return enc
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    return len(_encoding(model).encode(text or "", disallowed_special=()))
+
+
+def truncate_tokens(
+    text: str, max_tokens: int, model: str = DEFAULT_MODEL, tail_share: float = 0.1
+) -> str:
+    """
+    Cut `text` to at most `max_tokens`, keeping the head (where news puts the
+    facts) and a short tail (sign-offs, dates), joined by a marker.
+    """
+    if not text:
+        return text
+    enc = _encoding(model)
+    tokens = enc.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    keep = max(0, max_tokens - len(enc.encode(_TRUNCATION_MARK)))
+    tail = int(keep * tail_share)
+    head = keep - tail
+    return (
+        enc.decode(tokens[:head])
+        + _TRUNCATION_MARK
+        + (enc.decode(tokens[-tail:]) if tail else "")
+    )
+
+
+def fit_to_budget(stage: str, text: str, model: str = DEFAULT_MODEL) -> str:
+    """truncate_tokens() with the stage's budget; records how often it cut."""
+    budget = STAGE_BUDGETS.get(stage)
+    if budget is None:
+        return text
+    out = truncate_tokens(text, budget, model)
+    if out is not text:
+        usage.record_truncation(stage)
+    return out
+
+
+def fit_items(
+    stage: str, items: List[str], model: str = DEFAULT_MODEL, separator: str = "\n"
+) -> List[str]:
+    """
+    Keep whole items in order until the stage budget is used up; the first
+    item is always kept (truncated if it alone exceeds the budget).
+    """
+    budget = STAGE_BUDGETS.get(stage)
+    if budget is None or not items:
+        return items
+    sep_tokens = count_tokens(separator, model)
+    first = truncate_tokens(items[0], budget, model)
+    kept, used = [first], count_tokens(first, model)
+    for item in items[1:]:
+        n = count_tokens(item, model) + sep_tokens
+        if used + n > budget:
+            break
+        kept.append(item)
+        used += n
+    if len(kept) < len(items) or first is not items[0]:
+        usage.record_truncation(stage)
+    return kept
+
+
+class TokenUsage:
+    """Per-stage counters: calls, cache hits, measured prompt tokens and API usage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Counter] = defaultdict(Counter)
+
+    def record_prompt(self, stage: str, prompt_tokens: int, cached: bool) -> None:
+        with self._lock:
+            c = self._stages[stage]
+            c["calls"] += 1
+            c["cache_hits"] += int(cached)
+            c["prompt_tokens_measured"] += prompt_tokens
+
+    def record_api_usage(
+        self, stage: str, input_tokens: int, output_tokens: int, model: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            c = self._stages[stage]
+            c["input_tokens"] += input_tokens
+            c["output_tokens"] += output_tokens
+        logger.debug(
+            "LLM usage stage=%s model=%s input=%d output=%d",
+            stage, model, input_tokens, output_tokens,
+        )
+
+    def record_truncation(self, stage: str) -> None:
+        with self._lock:
+            self._stages[stage]["truncated"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {stage: dict(c) for stage, c in self._stages.items()}
+
+
+usage = TokenUsage()
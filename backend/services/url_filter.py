@@ -0,0 +1,82 @@
+# services/url_filter.py
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Iterable, Optional, Set
+
+from sqlalchemy import select
+
+from backend.db.models import Article
+from backend.db.session import AsyncSessionLocal
+from backend.services.bloom_filter import BloomFilter, normalize_url
+
+URL_FILTER_PATH = os.getenv("URL_FILTER_PATH", ".cache/known_urls.bloom")
+URL_FILTER_ERROR_RATE = float(os.getenv("URL_FILTER_ERROR_RATE", "0.001"))
+# Rebuilt from the articles table after this long (also drops deleted URLs)
+URL_FILTER_REBUILD_S = float(os.getenv("URL_FILTER_REBUILD_S", str(6 * 3600)))
+# Headroom so URLs added between rebuilds keep the error rate near target
+_MIN_CAPACITY = 100_000
+_CAPACITY_FACTOR = 2
+
+
+class KnownUrlFilter:
+    """
+    Known-article URL filter for the scraper. The Bloom filter answers "surely
+    new" locally; possible hits are confirmed against the DB in one query.
+    Persisted to disk and rebuilt from the articles table every
+    URL_FILTER_REBUILD_S.
+    """
+
+    def __init__(self, path: Optional[str] = URL_FILTER_PATH):
+        self.path = path
+        self._bloom: Optional[BloomFilter] = None
+        self._lock = asyncio.Lock()
+
+    async def ensure_fresh(self) -> None:
+        if self._bloom is not None and time.time() - self._bloom.built_at < URL_FILTER_REBUILD_S:
+            return
+        async with self._lock:
+            if self._bloom is None and self.path:
+                self._bloom = BloomFilter.load(self.path)
+            if self._bloom is None or time.time() - self._bloom.built_at >= URL_FILTER_REBUILD_S:
+                await self.rebuild()
+
+    async def rebuild(self) -> None:
+        async with AsyncSessionLocal() as session:
+            urls = list((await session.execute(select(Article.url))).scalars())
+        capacity = max(_MIN_CAPACITY, _CAPACITY_FACTOR * len(urls))
+        bloom = BloomFilter.for_capacity(capacity, URL_FILTER_ERROR_RATE)
+        await asyncio.to_thread(bloom.add_many, urls)
+        if self.path:
+            await asyncio.to_thread(bloom.save, self.path)
+        self._bloom = bloom
+
+    def add(self, url: str) -> None:
+        """Record a newly stored URL (persisted with the next rebuild)."""
+        if self._bloom is not None:
+            self._bloom.add_many([url])
+
+    async def known(self, urls: Iterable[str]) -> Set[str]:
+        """Subset of `urls` already stored in articles."""
+        urls = [u for u in urls if u]
+        if not urls:
+            return set()
+        await self.ensure_fresh()
+        maybe = [u for u, hit in zip(urls, self._bloom.contains_many(urls)) if hit]
+        if not maybe:
+            return set()
+        lookup = {}
+        for u in maybe:
+            lookup[u] = u
+            lookup.setdefault(normalize_url(u), u)
+        async with AsyncSessionLocal() as session:
+            rows = await session.execute(
+                select(Article.url).where(Article.url.in_(list(lookup)))
+            )
+            found = {lookup[u] for u in rows.scalars()}
+        return found
+
+
+known_urls = KnownUrlFilter()
@@ -0,0 +1,194 @@
+# services/vector_index.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VECTOR_DIM = 1536
+# Below this size an exact matmul over every row is fastest; above it the
+# rows are partitioned into IVF lists and only the closest lists are scanned.
+IVF_MIN_ITEMS = int(os.getenv("VECTOR_INDEX_IVF_MIN_ITEMS", "20000"))
+IVF_NPROBE = int(os.getenv("VECTOR_INDEX_IVF_NPROBE", "8"))
+_KMEANS_ITERS = 8
+_KMEANS_SAMPLE = 20000
+_EVICT_EVERY_S = 600
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return x / norms
+
+
+def _train_ivf(data: np.ndarray) -> Tuple[np.ndarray, List[List[int]]]:
+    """k-means centroids over `data` and each row's list; pure, runs in a thread."""
+    n = data.shape[0]
+    n_lists = max(1, int(np.sqrt(n)))
+    rng = np.random.default_rng(0)
+    sample = data[rng.choice(n, size=min(n, _KMEANS_SAMPLE), replace=False)]
+    centroids = sample[rng.choice(sample.shape[0], size=n_lists, replace=False)]
+    for _ in range(_KMEANS_ITERS):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        for c in range(n_lists):
+            members = sample[assign == c]
+            if len(members):
+                centroids[c] = members.mean(axis=0)
+        centroids = _normalize(centroids)
+    assign = np.argmax(data @ centroids.T, axis=1)
+    return centroids, [np.flatnonzero(assign == c).tolist() for c in range(n_lists)]
+
+
+class RecentVectorIndex:
+    """
+    In-memory cosine index over the recent-article window shared by semantic
+    dedup and related-article lookup. Rows are L2-normalized float32, so the
+    similarity is a dot product; metadata per row mirrors the columns the
+    callers would otherwise SELECT.
+
+    IVF training runs in a worker thread on a snapshot of the rows; searches
+    use exact scans (or the previous IVF lists) until the trained lists are
+    swapped in with a single assignment.
+    """
+
+    def __init__(self, window_s: float, dim: int = VECTOR_DIM):
+        self.window_s = window_s
+        self.dim = dim
+        self.ready = False
+        self._vecs = np.empty((1024, dim), dtype=np.float32)
+        self._ts = np.empty(1024, dtype=np.float64)
+        self._meta: List[Dict[str, Any]] = []
+        self._pos: Dict[str, int] = {}
+        self._last_evict = time.time()
+        # IVF state: (centroids, lists), None while the index is small
+        self._ivf: Optional[Tuple[np.ndarray, List[List[int]]]] = None
+        self._trained_size = 0
+        # Bumped whenever rows are renumbered (eviction); a training run
+        # started before that is discarded
+        self._generation = 0
+        self._training: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+    # ---------- updates ----------
+    def add(self, emb, meta: Dict[str, Any], fetched_at: Optional[datetime] = None) -> None:
+        url = meta["url"]
+        vec = _normalize(np.asarray(emb, dtype=np.float32).reshape(1, -1))[0]
+        ts = fetched_at.timestamp() if fetched_at else time.time()
+        i = self._pos.get(url)
+        if i is not None:
+            # Same URL again: refresh in place (IVF list membership may go stale
+            # until the next retrain, which only costs recall for this row)
+            self._vecs[i], self._ts[i], self._meta[i] = vec, ts, meta
+            return
+
+        n = len(self._meta)
+        if n == self._vecs.shape[0]:
+            self._vecs = np.concatenate([self._vecs, np.empty_like(self._vecs)])
+            self._ts = np.concatenate([self._ts, np.empty_like(self._ts)])
+        self._vecs[n], self._ts[n] = vec, ts
+        self._meta.append(meta)
+        self._pos[url] = n
+
+        ivf = self._ivf
+        if ivf is not None:
+            ivf[1][int(np.argmax(ivf[0] @ vec))].append(n)
+        self._maybe_train()
+        if time.time() - self._last_evict > _EVICT_EVERY_S:
+            self.evict_expired()
+
+    def evict_expired(self) -> None:
+        self._last_evict = time.time()
+        n = len(self._meta)
+        keep = self._ts[:n] >= self._last_evict - self.window_s
+        if keep.all():
+            return
+        idx = np.flatnonzero(keep)
+        self._vecs[: idx.size] = self._vecs[idx]
+        self._ts[: idx.size] = self._ts[idx]
+        self._meta = [self._meta[i] for i in idx]
+        self._pos = {m["url"]: i for i, m in enumerate(self._meta)}
+        self._generation += 1
+        self._ivf, self._trained_size = None, 0
+        self._maybe_train()
+
+    def _maybe_train(self) -> None:
+        n = len(self._meta)
+        if self._training is not None or n < IVF_MIN_ITEMS or n < 2 * self._trained_size:
+            return
+        data, gen = self._vecs[:n].copy(), self._generation
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to protect (scripts, sync callers): train inline
+            self._install(_train_ivf(data), n)
+            return
+        self._training = loop.create_task(asyncio.to_thread(_train_ivf, data))
+        self._training.add_done_callback(lambda task: self._on_trained(task, n, gen))
+
+    def _on_trained(self, task: asyncio.Task, n: int, gen: int) -> None:
+        self._training = None
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.warning("IVF training failed", exc_info=task.exception())
+            return
+        if gen == self._generation:
+            self._install(task.result(), n)
+        self._maybe_train()
+
+    def _install(self, trained: Tuple[np.ndarray, List[List[int]]], n: int) -> None:
+        centroids, lists = trained
+        # Rows added while the snapshot was being trained
+        m = len(self._meta)
+        if m > n:
+            for off, c in enumerate(np.argmax(self._vecs[n:m] @ centroids.T, axis=1)):
+                lists[int(c)].append(n + off)
+        self._ivf = (centroids, lists)
+        self._trained_size = n
+
+    # ---------- queries ----------
+    def search(
+        self,
+        emb,
+        k: int,
+        max_age_s: Optional[float] = None,
+        exclude_url: Optional[str] = None,
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """Top-k (cosine similarity, metadata) pairs, best first."""
+        n = len(self._meta)
+        if n == 0:
+            return []
+        q = _normalize(np.asarray(emb, dtype=np.float32).reshape(1, -1))[0]
+
+        ivf = self._ivf
+        if ivf is not None:
+            centroids, lists = ivf
+            nprobe = min(IVF_NPROBE, len(lists))
+            probe = np.argpartition(-(centroids @ q), nprobe - 1)[:nprobe]
+            rows = np.fromiter(
+                (i for c in probe for i in lists[c] if i < n), dtype=np.int64
+            )
+        else:
+            rows = np.arange(n)
+
+        if max_age_s is not None:
+            rows = rows[self._ts[rows] >= time.time() - max_age_s]
+        if exclude_url is not None and exclude_url in self._pos:
+            rows = rows[rows != self._pos[exclude_url]]
+        if rows.size == 0:
+            return []
+
+        sims = self._vecs[rows] @ q
+        top = min(k, sims.size)
+        best = np.argpartition(-sims, top - 1)[:top]
+        best = best[np.argsort(-sims[best])]
+        return [(float(sims[b]), self._meta[rows[b]]) for b in best]
@@ -1,10 +1,14 @@
 # services/verify_output.py
 from __future__ import annotations
-from typing import List, Dict, Any
+import re
+from typing import Any, Dict, Iterable, List, Set
 from pydantic import BaseModel, Field
 from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 
+from backend.services.llm_cache import ainvoke_cached
+from backend.services.token_budget import fit_to_budget
+
 
 class VerificationResult(BaseModel):
     ok: bool
@@ -36,6 +40,68 @@ PACKET:
 )
 
 
-def verify_packet(sources_text: str, packet_json: Dict[str, Any]) -> VerificationResult:
-    chain = verify_prompt | _checker.with_structured_output(VerificationResult)
-    return chain.invoke({"sources_text": sources_text, "packet_text": str(packet_json)})
+async def verify_packet(
+    sources_text: str, packet_json: Dict[str, Any]
+) -> VerificationResult:
+    return await ainvoke_cached(
+        verify_prompt,
+        _checker.with_structured_output(VerificationResult),
+        {
+            "sources_text": fit_to_budget("verify_packet", sources_text),
+            "packet_text": str(packet_json),
+        },
+        template_id="verify_packet",
+        llm=_checker,
+        schema=VerificationResult,
+    )
+
+
+_NUMBER_RE = re.compile(r"(?<![\w.])\d[\d,]*(?:\.\d+)?")
+
+
+def _numbers(text: str) -> Set[float]:
+    out = set()
+    for m in _NUMBER_RE.finditer(text):
+        try:
+            out.add(round(float(m.group().replace(",", "")), 6))
+        except ValueError:
+            pass
+    return out
+
+
+def _fact_numbers(values: Iterable[Any]) -> Set[float]:
+    # Ratios in the extracted numerics are often written as percentages
+    out = set()
+    for v in values:
+        if isinstance(v, (int, float)) and not isinstance(v, bool):
+            out.update({round(float(v), 6), round(float(v) * 100, 6)})
+    return out
+
+
+def check_brief_numbers(
+    sources_text: str, extracted: Dict[str, Any], packet: Dict[str, Any]
+) -> VerificationResult:
+    """
+    Deterministic check of the written brief: every figure it quotes must
+    come from the sources or the (separately verified) extracted facts.
+    Small counts and years are not checked.
+    """
+    known = _numbers(sources_text) | _numbers(str(extracted))
+    known |= _fact_numbers((extracted.get("numerics") or {}).values())
+    text = " ".join(
+        [packet.get("executive_summary") or ""]
+        + [str(x) for key in ("bullets", "actions", "risks") for x in packet.get(key) or []]
+    )
+    issues = [
+        f"Figure {n:g} in the brief is not in the sources"
+        for n in sorted(_numbers(text) - known)
+        if not (n.is_integer() and (n < 10 or 1900 <= n <= 2100))
+    ]
+    return VerificationResult(ok=not issues, issues=issues)
+
+
+def merge_verifications(*results: VerificationResult) -> VerificationResult:
+    return VerificationResult(
+        ok=all(r.ok for r in results),
+        issues=[issue for r in results for issue in r.issues],
+    )
@@ -0,0 +1,66 @@
+# tests/test_bloom_filter.py
+from backend.services.bloom_filter import BloomFilter, normalize_url
+
+
+def _urls(prefix: str, n: int):
+    return [f"https://news.example.com/{prefix}/{i}" for i in range(n)]
+
+
+def test_normalize_url():
+    assert (
+        normalize_url(" https://WWW.Example.com/markets/story/?utm_source=rss&id=3#top ")
+        == "https://example.com/markets/story?id=3"
+    )
+    assert normalize_url("HTTPS://example.com/a") == normalize_url("https://www.example.com/a/")
+
+
+def test_no_false_negatives():
+    bloom = BloomFilter.for_capacity(5000, error_rate=0.01)
+    urls = _urls("stored", 5000)
+    bloom.add_many(urls)
+    assert bloom.items == 5000
+    assert bloom.contains_many(urls).all()
+    # Membership is on the normalized URL
+    assert "https://www.news.example.com/stored/7/?utm_medium=feed" in bloom
+
+
+def test_false_positive_rate_near_target():
+    bloom = BloomFilter.for_capacity(5000, error_rate=0.01)
+    bloom.add_many(_urls("stored", 5000))
+    rate = bloom.contains_many(_urls("other", 20000)).mean()
+    assert rate < 0.02
+
+
+def test_empty_inputs():
+    bloom = BloomFilter.for_capacity(100)
+    bloom.add_many([])
+    assert bloom.items == 0
+    assert bloom.contains_many([]).shape == (0,)
+    assert "https://example.com/a" not in bloom
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "bloom" / "known_urls.bloom")
+    bloom = BloomFilter.for_capacity(1000)
+    urls = _urls("stored", 300)
+    bloom.add_many(urls)
+    bloom.save(path)
+
+    loaded = BloomFilter.load(path)
+    assert (loaded.n_bits, loaded.n_hashes, loaded.items) == (bloom.n_bits, bloom.n_hashes, 300)
+    assert loaded.built_at == bloom.built_at
+    assert loaded.contains_many(urls).all()
+
+
+def test_load_rejects_missing_or_damaged_files(tmp_path):
+    assert BloomFilter.load(str(tmp_path / "missing.bloom")) is None
+
+    path = tmp_path / "known_urls.bloom"
+    BloomFilter.for_capacity(1000).save(str(path))
+    data = path.read_bytes()
+    path.write_bytes(b"XXXX" + data[4:])
+    assert BloomFilter.load(str(path)) is None
+    path.write_bytes(data[:-1])
+    assert BloomFilter.load(str(path)) is None
+    path.write_bytes(data[:10])
+    assert BloomFilter.load(str(path)) is None
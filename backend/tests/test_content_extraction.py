@@ -0,0 +1,64 @@
+# tests/test_content_extraction.py
+from backend.services.content_extraction import (
+    CONTENT_EXTRACTION_SKIP_LLM,
+    extract_main_content,
+    looks_walled,
+    split_blocks,
+)
+
+TITLE = "Fed raises rates by a quarter point"
+PARAGRAPH = (
+    "The Federal Reserve raised its benchmark rate by a quarter point on Wednesday, "
+    "citing persistent services inflation and a labour market that remains tight. "
+    "Officials signalled that further increases would depend on incoming data."
+)
+NAV = "[Markets](https://x.com/m) [Economy](https://x.com/e) [Tech](https://x.com/t) [Video](https://x.com/v)"
+FOOTER = "Copyright 2025. All rights reserved. Privacy policy. Terms of use."
+
+
+def _page(paragraphs: int, title: str = TITLE) -> str:
+    return "\n\n".join(
+        [NAV, "Accept all cookies to continue", f"# {title}"]
+        + [PARAGRAPH] * paragraphs
+        + ["## Related articles", NAV, FOOTER]
+    )
+
+
+def test_body_is_found_between_the_chrome():
+    result = extract_main_content(_page(6), TITLE)
+    assert result.main_text.count("Federal Reserve") == 6
+    assert "cookies" not in result.main_text
+    assert "Copyright" not in result.main_text
+    assert "https://" not in result.main_text
+
+
+def test_long_article_under_its_title_is_confident():
+    result = extract_main_content(_page(10), TITLE)
+    assert result.words >= 250
+    assert result.confidence >= CONTENT_EXTRACTION_SKIP_LLM
+
+
+def test_confidence_grows_with_body_and_title_match():
+    short = extract_main_content(_page(3), TITLE)
+    long = extract_main_content(_page(10), TITLE)
+    untitled = extract_main_content(_page(10), None)
+    assert 0 < short.confidence < long.confidence <= 1
+    assert untitled.confidence < long.confidence
+
+
+def test_no_body_means_zero_confidence():
+    assert extract_main_content("").confidence == 0.0
+    teaser = "\n\n".join([NAV, f"# {TITLE}", PARAGRAPH, FOOTER])
+    assert extract_main_content(teaser, TITLE).confidence == 0.0
+
+
+def test_link_lists_and_short_chrome_are_not_content():
+    blocks = split_blocks("\n\n".join([NAV, FOOTER, PARAGRAPH]))
+    assert [b.is_content for b in blocks] == [False, False, True]
+
+
+def test_wall_marker_only_counts_on_short_pages():
+    page = "Subscribe to unlock this article"
+    assert looks_walled(page, body_words=100, min_words=80)
+    assert not looks_walled(page, body_words=400, min_words=80)
+    assert not looks_walled("A normal article", body_words=100, min_words=80)
@@ -0,0 +1,61 @@
+# tests/test_dates.py
+from datetime import date, datetime, timezone
+
+import pytest
+
+from backend.services.dates import as_utc_datetime, parse_published
+
+UTC = timezone.utc
+NOW = datetime(2025, 10, 1, 12, 0, tzinfo=UTC)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        # RSS published (RFC 822)
+        ("Wed, 01 Oct 2025 15:04:00 GMT", datetime(2025, 10, 1, 15, 4, tzinfo=UTC)),
+        ("Wed, 01 Oct 2025 11:04:00 -0400", datetime(2025, 10, 1, 15, 4, tzinfo=UTC)),
+        # <time datetime>
+        ("2025-10-01T15:04:00Z", datetime(2025, 10, 1, 15, 4, tzinfo=UTC)),
+        ("2025-10-01T17:04:00+02:00", datetime(2025, 10, 1, 15, 4, tzinfo=UTC)),
+        # Reuters
+        ("October 1, 2025 · 3:04 PM GMT+1", datetime(2025, 10, 1, 14, 4, tzinfo=UTC)),
+        # Yahoo
+        ("Tue, October 1, 2025 at 3:04 PM EDT", datetime(2025, 10, 1, 19, 4, tzinfo=UTC)),
+        # CNBC
+        ("Sep 20 2024 9:05 AM EDT", datetime(2024, 9, 20, 13, 5, tzinfo=UTC)),
+        ("Sep 20 2024 12:30 AM EST", datetime(2024, 9, 20, 5, 30, tzinfo=UTC)),
+        # FT and day-first
+        ("October 1 2025", datetime(2025, 10, 1, tzinfo=UTC)),
+        ("1 October 2025", datetime(2025, 10, 1, tzinfo=UTC)),
+    ],
+)
+def test_source_formats(text, expected):
+    assert parse_published(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("2h ago", datetime(2025, 10, 1, 10, 0, tzinfo=UTC)),
+        ("an hour ago", datetime(2025, 10, 1, 11, 0, tzinfo=UTC)),
+        ("15 mins ago", datetime(2025, 10, 1, 11, 45, tzinfo=UTC)),
+        ("yesterday", datetime(2025, 9, 30, 12, 0, tzinfo=UTC)),
+        ("just now", NOW),
+    ],
+)
+def test_relative_times(text, expected):
+    assert parse_published(text, now=NOW) == expected
+
+
+@pytest.mark.parametrize(
+    "text", ["", "   ", "not a date", "Smarch 1, 2025", "February 30, 2025", "Oct 1 2025 3:04 PM XYZ"]
+)
+def test_unrecognised_values(text):
+    assert parse_published(text, now=NOW) is None
+
+
+def test_dates_and_naive_datetimes_are_utc():
+    assert parse_published(date(2025, 10, 1)) == datetime(2025, 10, 1, tzinfo=UTC)
+    assert as_utc_datetime(datetime(2025, 10, 1, 8)) == datetime(2025, 10, 1, 8, tzinfo=UTC)
+    assert parse_published(None) is None
@@ -0,0 +1,50 @@
+# tests/test_dedup_bands.py
+import random
+
+from backend.services.dedup import (
+    SIMHASH_BAND_BITS,
+    SIMHASH_BANDS,
+    hamming_distance,
+    simhash_bands,
+    to_signed_64,
+)
+
+
+def _flip(value: int, bits) -> int:
+    for b in bits:
+        value ^= 1 << b
+    return value
+
+
+def test_bands_reassemble_the_hash():
+    rng = random.Random(1)
+    for _ in range(100):
+        h = rng.getrandbits(64)
+        bands = simhash_bands(h)
+        assert len(bands) == SIMHASH_BANDS
+        assert sum(b << (i * SIMHASH_BAND_BITS) for i, b in enumerate(bands)) == h
+
+
+def test_signed_and_unsigned_hash_give_the_same_bands():
+    h = 0xF000_0000_0000_0001
+    assert to_signed_64(h) < 0
+    assert simhash_bands(to_signed_64(h)) == simhash_bands(h)
+
+
+def test_near_duplicates_share_a_band():
+    # Pigeonhole: fewer differing bits than bands leaves one band untouched
+    rng = random.Random(2)
+    for _ in range(2000):
+        h = rng.getrandbits(64)
+        d = rng.randrange(SIMHASH_BANDS)
+        other = _flip(h, rng.sample(range(64), d))
+        assert hamming_distance(h, other) == d
+        assert any(a == b for a, b in zip(simhash_bands(h), simhash_bands(other)))
+
+
+def test_one_flip_per_band_defeats_the_lookup():
+    # The bound is tight: SIMHASH_BANDS bits, one in each band, share none
+    h = random.Random(3).getrandbits(64)
+    other = _flip(h, [i * SIMHASH_BAND_BITS for i in range(SIMHASH_BANDS)])
+    assert hamming_distance(h, other) == SIMHASH_BANDS
+    assert all(a != b for a, b in zip(simhash_bands(h), simhash_bands(other)))
@@ -0,0 +1,44 @@
+# tests/test_hamming.py
+import random
+
+import numpy as np
+
+from backend.services import dedup
+from backend.services.dedup import hamming_distance, hamming_matrix, to_signed_64
+
+
+def _hashes(n: int, seed: int):
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(n)]
+
+
+def test_matrix_matches_scalar_distance():
+    queries, candidates = _hashes(7, 1), _hashes(50, 2)
+    m = hamming_matrix(queries, candidates)
+    assert m.shape == (7, 50)
+    assert m.dtype == np.uint8
+    for i, q in enumerate(queries):
+        for j, c in enumerate(candidates):
+            assert m[i, j] == hamming_distance(q, c)
+
+
+def test_signed_db_values_match_unsigned():
+    # Postgres BIGINT columns hand back the signed form
+    values = _hashes(20, 3)
+    signed = [to_signed_64(v) for v in values]
+    np.testing.assert_array_equal(
+        hamming_matrix(signed, np.array(signed, dtype=np.int64)),
+        hamming_matrix(values, values),
+    )
+
+
+def test_single_query_and_extremes():
+    m = hamming_matrix(0, [0, 1, 0xFFFF_FFFF_FFFF_FFFF])
+    assert m.tolist() == [[0, 1, 64]]
+
+
+def test_lookup_table_popcount_matches(monkeypatch):
+    x = np.array(_hashes(100, 4), dtype=np.uint64)
+    expected = [bin(int(v)).count("1") for v in x]
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+    assert dedup._popcount64(x).tolist() == expected
@@ -0,0 +1,87 @@
+# tests/test_llm_cache.py
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.prompts import ChatPromptTemplate  # noqa: E402
+from langchain_core.runnables import RunnableLambda  # noqa: E402
+from pydantic import BaseModel, create_model  # noqa: E402
+
+from backend.services.llm_cache import LLMCache, _bound_tools, _decode, _encode, cache_key  # noqa: E402
+
+PROMPT = ChatPromptTemplate.from_messages([("system", "Summarise:\n{text}")])
+LLM = SimpleNamespace(model_name="gpt-4o", temperature=0.1)
+TOOL = {"type": "function", "function": {"name": "Facts", "parameters": {"type": "object"}}}
+
+
+class Facts(BaseModel):
+    tickers: List[str] = []
+
+
+def _key(text="Fed raises rates", llm=LLM, template="t", **kw):
+    return cache_key(llm, template, PROMPT.invoke({"text": text}), **kw)
+
+
+def test_key_is_stable_and_covers_the_call():
+    assert _key() == _key()
+    assert _key() != _key(text="Fed holds rates")
+    assert _key() != _key(template="other")
+    assert _key() != _key(llm=SimpleNamespace(model_name="gpt-4o", temperature=0.5))
+    assert _key() != _key(llm=SimpleNamespace(model_name="gpt-4o-mini", temperature=0.1))
+
+
+def test_key_changes_with_the_output_schema():
+    # Same class name, one more field: cached answers no longer fit
+    Facts2 = create_model("Facts", tickers=(List[str], []), sectors=(List[str], []))
+    assert _key(schema=Facts) == _key(schema=Facts)
+    assert _key(schema=Facts) != _key(schema=Facts2)
+    assert _key(schema=Facts) != _key()
+
+
+def test_key_changes_with_bound_tools():
+    other = {**TOOL, "function": {**TOOL["function"], "name": "Other"}}
+    assert _key(tools=[{"tools": [TOOL]}]) != _key(tools=[{"tools": [other]}])
+    assert _key(tools=[]) == _key()
+
+
+def test_bound_tools_are_found_through_sequences():
+    model = RunnableLambda(lambda x: x).bind(tools=[TOOL], tool_choice="Facts")
+    chain = model | RunnableLambda(lambda x: x)
+    assert _bound_tools(chain) == [{"tools": [TOOL]}, {"tool_choice": "Facts"}]
+    assert _bound_tools(RunnableLambda(lambda x: x)) == []
+
+
+def test_structured_outputs_round_trip():
+    value = Facts(tickers=["AAPL"])
+    assert _decode(_encode(value), Facts) == value
+    assert _decode(_encode({"a": 1}), None) == {"a": 1}
+
+
+def test_store_hits_misses_and_ttl(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "llm.sqlite3"), ttl_s=60, max_items=10)
+    assert cache.get("k", "t") is None
+    cache.put("k", "t", "payload")
+    assert cache.get("k", "t") == "payload"
+    assert cache.stats == {"t:misses": 1, "t:hits": 1}
+
+    expired = LLMCache(path=str(tmp_path / "llm.sqlite3"), ttl_s=-1)
+    assert expired.get("k", "t") is None
+    assert expired.get("k", "t", ignore_ttl=True) == "payload"
+
+
+def test_store_is_bounded(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "llm.sqlite3"), ttl_s=60, max_items=10)
+    for i in range(25):
+        cache.put(f"k{i}", "t", "payload")
+    assert cache._count <= 10
+    assert cache.get("k24", "t") == "payload"
+
+
+def test_replacing_a_key_does_not_grow_the_count(tmp_path):
+    cache = LLMCache(path=str(tmp_path / "llm.sqlite3"), ttl_s=60, max_items=10)
+    for _ in range(20):
+        cache.put("k", "t", "payload")
+    assert cache._count == 1
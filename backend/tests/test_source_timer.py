@@ -0,0 +1,70 @@
+# tests/test_source_timer.py
+import uuid
+
+import pytest
+
+from backend.core import source_timer
+from backend.core.source_timer import (
+    SCHEDULER_DEFAULT_INTERVAL_S,
+    SCHEDULER_MAX_INTERVAL_S,
+    SCHEDULER_MIN_INTERVAL_S,
+    SourceTimer,
+    initial_interval,
+)
+
+NOW = 1000.0
+
+
+@pytest.fixture(autouse=True)
+def frozen_clock(monkeypatch):
+    monkeypatch.setattr(source_timer.time, "monotonic", lambda: NOW)
+
+
+def _timer(interval: float) -> SourceTimer:
+    return SourceTimer(uuid.uuid4(), "https://example.com/rss", interval, delay=0.0)
+
+
+def test_initial_interval_targets_one_article_per_tick():
+    assert initial_interval(48) == 1800
+    assert initial_interval(None) == SCHEDULER_DEFAULT_INTERVAL_S
+    assert initial_interval(0) == SCHEDULER_DEFAULT_INTERVAL_S
+    assert initial_interval(100_000) == SCHEDULER_MIN_INTERVAL_S
+    assert initial_interval(1) == SCHEDULER_MAX_INTERVAL_S
+
+
+def test_success_adapts_the_interval():
+    timer = _timer(1000)
+    timer.after_success(new_articles=3)
+    assert timer.interval == 500
+    assert timer.next_run == NOW + 500
+    timer.after_success(new_articles=0)
+    assert timer.interval == 750
+
+
+def test_interval_stays_within_bounds():
+    fast, slow = _timer(SCHEDULER_MIN_INTERVAL_S), _timer(SCHEDULER_MAX_INTERVAL_S)
+    fast.after_success(new_articles=5)
+    slow.after_success(new_articles=0)
+    assert fast.interval == SCHEDULER_MIN_INTERVAL_S
+    assert slow.interval == SCHEDULER_MAX_INTERVAL_S
+
+
+def test_failures_back_off_exponentially_and_keep_the_interval():
+    timer = _timer(300)
+    waits = []
+    for _ in range(5):
+        timer.after_failure()
+        waits.append(timer.next_run - NOW)
+    assert waits == [600, 1200, 2400, SCHEDULER_MAX_INTERVAL_S, SCHEDULER_MAX_INTERVAL_S]
+    assert timer.failures == 5
+    assert timer.interval == 300
+
+
+def test_success_resets_the_backoff():
+    timer = _timer(300)
+    timer.after_failure()
+    timer.after_failure()
+    timer.after_success(new_articles=1)
+    assert timer.failures == 0
+    timer.after_failure()
+    assert timer.next_run == NOW + 300
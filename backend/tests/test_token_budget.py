@@ -0,0 +1,92 @@
+# tests/test_token_budget.py
+import pytest
+
+tiktoken = pytest.importorskip("tiktoken")
+try:
+    # First use downloads the BPE file; offline runs skip instead of failing
+    tiktoken.get_encoding("o200k_base")
+except Exception as e:  # network / cache errors surface as various types
+    pytest.skip(f"o200k_base encoding unavailable: {e}", allow_module_level=True)
+
+from backend.services import token_budget  # noqa: E402
+from backend.services.token_budget import (  # noqa: E402
+    TokenUsage,
+    count_tokens,
+    fit_items,
+    fit_to_budget,
+    truncate_tokens,
+)
+
+STAGE = "news_analysis.extract"
+
+
+def _text(n_words: int, word: str = "market") -> str:
+    return " ".join(f"{word}{i}" for i in range(n_words))
+
+
+@pytest.fixture
+def small_budget(monkeypatch):
+    monkeypatch.setitem(token_budget.STAGE_BUDGETS, STAGE, 200)
+    monkeypatch.setattr(token_budget, "usage", TokenUsage())
+    return 200
+
+
+def test_text_within_budget_is_returned_as_is():
+    text = _text(20)
+    assert truncate_tokens(text, 1000) is text
+    assert truncate_tokens("", 10) == ""
+
+
+def test_truncation_keeps_head_and_tail_within_budget():
+    text = _text(2000)
+    out = truncate_tokens(text, 300)
+    assert count_tokens(out) <= 300
+    assert out.startswith("market0 market1")
+    assert out.endswith("market1999")
+    assert "[... truncated ...]" in out
+
+
+def test_fit_to_budget_counts_truncations(small_budget):
+    assert fit_to_budget(STAGE, _text(10)) == _text(10)
+    assert count_tokens(fit_to_budget(STAGE, _text(1000))) <= small_budget
+    assert token_budget.usage.snapshot()[STAGE]["truncated"] == 1
+    # Stages without a budget pass through
+    text = _text(1000)
+    assert fit_to_budget("no.such.stage", text) is text
+
+
+def test_fit_items_keeps_whole_items_in_order(small_budget):
+    items = [_text(30, f"item{i}_") for i in range(20)]
+    kept = fit_items(STAGE, items)
+    assert 1 < len(kept) < len(items)
+    assert kept == items[: len(kept)]
+    assert count_tokens("\n".join(kept)) <= small_budget
+    assert token_budget.usage.snapshot()[STAGE]["truncated"] == 1
+
+
+def test_fit_items_always_keeps_a_truncated_first_item(small_budget):
+    kept = fit_items(STAGE, [_text(1000), _text(5)])
+    assert len(kept) == 1
+    assert count_tokens(kept[0]) <= small_budget
+
+
+def test_fit_items_without_cuts_is_not_recorded(small_budget):
+    items = [_text(5), _text(5)]
+    assert fit_items(STAGE, items) == items
+    assert "truncated" not in token_budget.usage.snapshot().get(STAGE, {})
+
+
+def test_usage_counters():
+    u = TokenUsage()
+    u.record_prompt("s", 100, cached=False)
+    u.record_prompt("s", 50, cached=True)
+    u.record_api_usage("s", 90, 10)
+    assert u.snapshot() == {
+        "s": {
+            "calls": 2,
+            "cache_hits": 1,
+            "prompt_tokens_measured": 150,
+            "input_tokens": 90,
+            "output_tokens": 10,
+        }
+    }
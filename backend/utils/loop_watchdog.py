@@ -0,0 +1,95 @@
+# utils/loop_watchdog.py
+"""
+Test mode for catching graph nodes that block the event loop.
+
+An async node only yields the loop at its awaits; everything between two
+awaits runs synchronously on the loop that also serves the HTTP API. With
+LOOP_BLOCK_CHECK enabled, watch_node() drives the node's coroutine step by
+step and times each synchronous step:
+
+    LOOP_BLOCK_CHECK=warn    log steps longer than LOOP_BLOCK_THRESHOLD_MS
+    LOOP_BLOCK_CHECK=strict  raise LoopBlockedError instead (for tests / CI)
+
+Sync nodes are left alone: LangGraph runs them in a worker thread.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import logging
+import os
+import time
+from typing import Any, Callable, Generator
+
+logger = logging.getLogger(__name__)
+
+LOOP_BLOCK_CHECK = os.getenv("LOOP_BLOCK_CHECK", "off").lower()
+LOOP_BLOCK_THRESHOLD_MS = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "100"))
+
+
+class LoopBlockedError(RuntimeError):
+    pass
+
+
+class _TimedAwait:
+    """Awaitable proxy that times every send()/throw() into the wrapped coroutine."""
+
+    def __init__(self, coro, name: str, threshold_s: float, strict: bool):
+        self._coro = coro
+        self._name = name
+        self._threshold_s = threshold_s
+        self._strict = strict
+
+    def _check(self, elapsed: float) -> None:
+        if elapsed < self._threshold_s:
+            return
+        msg = (
+            f"Node '{self._name}' blocked the event loop for {elapsed * 1000:.0f} ms "
+            f"(threshold {self._threshold_s * 1000:.0f} ms)"
+        )
+        if self._strict:
+            raise LoopBlockedError(msg)
+        logger.warning(msg)
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        gen = self._coro.__await__()
+        value, exc = None, None
+        while True:
+            start = time.perf_counter()
+            try:
+                yielded = gen.send(value) if exc is None else gen.throw(exc)
+            except StopIteration as stop:
+                self._check(time.perf_counter() - start)
+                return stop.value
+            try:
+                self._check(time.perf_counter() - start)
+            except LoopBlockedError:
+                gen.close()
+                raise
+            try:
+                value, exc = (yield yielded), None
+            except GeneratorExit:
+                gen.close()
+                raise
+            except BaseException as e:  # cancellation and friends go to the node
+                value, exc = None, e
+
+
+def watch_node(
+    fn: Callable,
+    name: str | None = None,
+    threshold_ms: float | None = None,
+    mode: str | None = None,
+) -> Callable:
+    """Wrap an async graph node for loop-block checks; a no-op when the check is off."""
+    mode = (mode or LOOP_BLOCK_CHECK).lower()
+    if mode not in ("warn", "strict") or not inspect.iscoroutinefunction(fn):
+        return fn
+    name = name or fn.__name__
+    threshold_s = (threshold_ms if threshold_ms is not None else LOOP_BLOCK_THRESHOLD_MS) / 1000.0
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await _TimedAwait(fn(*args, **kwargs), name, threshold_s, mode == "strict")
+
+    return wrapper